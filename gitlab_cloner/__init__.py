@@ -0,0 +1,97 @@
+"""
+GitLab Cloner - Clone and manage all repositories from a GitLab namespace.
+
+This tool automates the process of cloning or fetching all repositories from
+a GitLab namespace, including all nested subgroups. It provides intelligent
+sync capabilities, exclusion patterns, and dry-run functionality.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+from gitlab_cloner.cli import main, parse_arguments
+from gitlab_cloner.cloner import (
+    ACTIVITY_THROTTLE,
+    CACHE_FILE_NAME,
+    GRAPHQL_PROJECTS_QUERY,
+    LIST_OPTIONS,
+    PROJECT_LIST_OPTIONS,
+    GitLabCloner,
+    GraphQLProject,
+    PathManager,
+    Project,
+    ProjectCache,
+)
+from gitlab_cloner.config import (
+    DEFAULT_JOBS,
+    ApiType,
+    CloneMethod,
+    Config,
+    GitBackend,
+    SyncOptions,
+)
+from gitlab_cloner.errors import (
+    EXIT_AUTH_ERROR,
+    EXIT_EXECUTION_ERROR,
+    EXIT_GIT_CLONE_ERROR,
+    EXIT_GIT_FETCH_ERROR,
+    EXIT_GIT_NOT_FOUND,
+    EXIT_GITLAB_ERROR,
+    EXIT_MISSING_ARGUMENTS,
+    EXIT_PATH_ERROR,
+    EXIT_SUCCESS,
+    GitCloneError,
+    GitError,
+    GitFetchError,
+    GitRepositoryMissingError,
+)
+from gitlab_cloner.git import (
+    GIT_COMMAND,
+    STDERR_TAIL_BYTES,
+    SUBMODULE_JOBS,
+    GitOperations,
+)
+from gitlab_cloner.logger import USE_COLOR, Logger
+
+__all__ = [
+    "ACTIVITY_THROTTLE",
+    "CACHE_FILE_NAME",
+    "DEFAULT_JOBS",
+    "EXIT_AUTH_ERROR",
+    "EXIT_EXECUTION_ERROR",
+    "EXIT_GITLAB_ERROR",
+    "EXIT_GIT_CLONE_ERROR",
+    "EXIT_GIT_FETCH_ERROR",
+    "EXIT_GIT_NOT_FOUND",
+    "EXIT_MISSING_ARGUMENTS",
+    "EXIT_PATH_ERROR",
+    "EXIT_SUCCESS",
+    "GIT_COMMAND",
+    "GRAPHQL_PROJECTS_QUERY",
+    "LIST_OPTIONS",
+    "PROJECT_LIST_OPTIONS",
+    "STDERR_TAIL_BYTES",
+    "SUBMODULE_JOBS",
+    "USE_COLOR",
+    "ApiType",
+    "CloneMethod",
+    "Config",
+    "GitBackend",
+    "GitCloneError",
+    "GitError",
+    "GitFetchError",
+    "GitLabCloner",
+    "GitOperations",
+    "GitRepositoryMissingError",
+    "GraphQLProject",
+    "Logger",
+    "PathManager",
+    "Project",
+    "ProjectCache",
+    "SyncOptions",
+    "main",
+    "parse_arguments",
+]
@@ -0,0 +1,255 @@
+"""
+GitLab Cloner - command-line interface.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+import argparse
+import os
+import sys
+from typing import NoReturn
+
+from gitlab_cloner.cloner import GitLabCloner
+from gitlab_cloner.config import DEFAULT_JOBS, ApiType, CloneMethod, Config, GitBackend
+from gitlab_cloner.errors import EXIT_AUTH_ERROR
+from gitlab_cloner.logger import Logger
+
+
+def parse_arguments() -> Config:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Clone all repositories from a GitLab namespace",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s -n mygroup
+  %(prog)s -n mygroup -p /path/to/repos --dry-run
+  %(prog)s -n mygroup --exclude archived --exclude legacy
+  %(prog)s -n mygroup --jobs 16
+  %(prog)s -n mygroup --full-history
+  %(prog)s -n mygroup --full-clone
+        """,
+    )
+
+    parser.add_argument(
+        "-u",
+        "--url",
+        dest="url",
+        default="https://gitlab.com",
+        help="Base URL of the GitLab instance (default: https://gitlab.com)",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--token",
+        dest="token",
+        help="GitLab API token (can also use GITLAB_TOKEN env var)",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--namespace",
+        dest="namespace",
+        required=True,
+        help="Namespace (group) to clone",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--path",
+        dest="path",
+        default=os.getcwd(),
+        help="Destination path for cloned projects (default: current directory)",
+    )
+
+    parser.add_argument(
+        "--disable-root",
+        action="store_true",
+        dest="disable_root",
+        help="Do not create root namespace folder in path",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--dry-run",
+        action="store_true",
+        dest="dry_run",
+        help="List the repositories without clone/fetch",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--exclude",
+        dest="exclude",
+        action="append",
+        help="Pattern to exclude from subgroups and projects (can be repeated)",
+    )
+
+    parser.add_argument(
+        "--clone-method",
+        dest="clone_method",
+        choices=[method.value for method in CloneMethod],
+        default=CloneMethod.HTTPS.value,
+        help="Clone method: https or ssh (default: https)",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of parallel clone/fetch operations (default: {DEFAULT_JOBS})",
+    )
+
+    parser.add_argument(
+        "--depth",
+        dest="depth",
+        type=int,
+        default=1,
+        help="Clone with history truncated to this many commits (default: 1)",
+    )
+
+    parser.add_argument(
+        "--full-history",
+        action="store_true",
+        dest="full_history",
+        help="Clone and fetch the full history, still downloading blobs on demand",
+    )
+
+    parser.add_argument(
+        "--full-clone",
+        action="store_true",
+        dest="full_clone",
+        help="Clone full history with all file contents (no depth limit or filter)",
+    )
+
+    parser.add_argument(
+        "--git-backend",
+        dest="git_backend",
+        choices=[backend.value for backend in GitBackend],
+        default=GitBackend.GIT.value,
+        help="Clone with the git executable or in-process with pygit2 (default: git)",
+    )
+
+    parser.add_argument(
+        "--recurse-submodules",
+        action="store_true",
+        dest="recurse_submodules",
+        help="Clone and fetch submodules, transferring them in parallel",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        dest="verbose",
+        help="Print debug output",
+    )
+
+    parser.add_argument(
+        "--api",
+        dest="api",
+        choices=[api.value for api in ApiType],
+        default=ApiType.REST.value,
+        help="API used to list projects: rest or graphql (default: rest)",
+    )
+
+    parser.add_argument(
+        "--use-graphql",
+        action="store_const",
+        const=ApiType.GRAPHQL.value,
+        dest="api",
+        help="Same as --api graphql",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        dest="timeout",
+        type=float,
+        help="Abort a single clone or fetch after this many seconds (default: none)",
+    )
+
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_false",
+        dest="pipeline",
+        help="List all projects before cloning instead of cloning while listing",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help=("Sync every project, ignoring and rebuilding the activity cache"),
+    )
+
+    parser.add_argument(
+        "--visibility",
+        dest="visibility",
+        choices=["public", "internal", "private", "all"],
+        default="all",
+        help="Only sync projects with this visibility level (default: all)",
+    )
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.depth < 1:
+        parser.error("--depth must be a positive integer")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be a positive number")
+
+    # Handle token
+    token = args.token or os.getenv("GITLAB_TOKEN")
+    if not token:
+        Logger.error(
+            "error: gitlab token not provided. "
+            "use -t or set GITLAB_TOKEN environment variable"
+        )
+        sys.exit(EXIT_AUTH_ERROR)
+
+    if args.token:
+        Logger.warn(
+            "warning: token provided via command line argument "
+            "(consider using environment variable)"
+        )
+
+    return Config(
+        url=args.url,
+        token=token,
+        namespace=args.namespace,
+        path=args.path,
+        disable_root=args.disable_root,
+        dry_run=args.dry_run,
+        exclude=args.exclude,
+        clone_method=CloneMethod(args.clone_method),
+        jobs=args.jobs,
+        depth=0 if args.full_history or args.full_clone else args.depth,
+        clone_filter=None if args.full_clone else "blob:none",
+        recurse_submodules=args.recurse_submodules,
+        verbose=args.verbose,
+        api=ApiType(args.api),
+        timeout=args.timeout,
+        pipeline=args.pipeline,
+        use_cache=args.use_cache,
+        git_backend=GitBackend(args.git_backend),
+        visibility=None if args.visibility == "all" else args.visibility,
+    )
+
+
+def main() -> NoReturn:
+    """Main entry point."""
+    config = parse_arguments()
+    Logger.VERBOSE = config.verbose
+    cloner = GitLabCloner(config)
+    sys.exit(cloner.run())
+
+
+if __name__ == "__main__":
+    main()
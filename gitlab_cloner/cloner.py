@@ -0,0 +1,644 @@
+"""
+GitLab Cloner - project discovery and parallel syncing.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Set, Tuple
+
+import gitlab
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from gitlab_cloner.config import ApiType, CloneMethod, Config, GitBackend, SyncOptions
+from gitlab_cloner.errors import (
+    EXIT_AUTH_ERROR,
+    EXIT_EXECUTION_ERROR,
+    EXIT_GITLAB_ERROR,
+    EXIT_PATH_ERROR,
+    EXIT_SUCCESS,
+    GitError,
+)
+from gitlab_cloner.git import GitOperations
+from gitlab_cloner.logger import Logger
+
+# File in the destination path remembering project activity between runs
+CACHE_FILE_NAME = ".gitlab-cloner-cache.json"
+
+# GitLab refreshes last_activity_at on push at most this often
+ACTIVITY_THROTTLE = timedelta(hours=1)
+
+# GitLab API list options: maximum page size, stable ordering, lazy paging
+LIST_OPTIONS = {"per_page": 100, "order_by": "id", "sort": "asc", "iterator": True}
+
+# Project listings only need the fields of the simple representation
+PROJECT_LIST_OPTIONS = {**LIST_OPTIONS, "simple": True}
+
+# GraphQL query listing every project below a group, 100 per page
+GRAPHQL_PROJECTS_QUERY = """
+query($fullPath: ID!, $after: String) {
+  group(fullPath: $fullPath) {
+    projects(includeSubgroups: true, first: 100, after: $after) {
+      nodes {
+        id
+        fullPath
+        httpUrlToRepo
+        sshUrlToRepo
+        lastActivityAt
+        visibility
+      }
+      pageInfo { endCursor hasNextPage }
+    }
+  }
+}
+"""
+
+
+class Project(Protocol):
+    """Attributes of a GitLab project used for syncing."""
+
+    id: int
+    path_with_namespace: str
+    http_url_to_repo: str
+    ssh_url_to_repo: str
+    last_activity_at: str
+
+
+@dataclass
+class GraphQLProject:
+    """Project attributes returned by the GitLab GraphQL API."""
+
+    id: int
+    path_with_namespace: str
+    http_url_to_repo: str
+    ssh_url_to_repo: str
+    last_activity_at: str
+
+
+class PathManager:
+    """Handles path operations and calculations."""
+
+    # Parent directories already created by this process
+    _created_dirs: Set[str] = set()
+    _created_dirs_lock = threading.Lock()
+
+    @classmethod
+    def ensure_parent_directories(cls, path: str) -> None:
+        """Create parent directories if they don't exist."""
+        parent_dir = os.path.dirname(path)
+        if parent_dir in cls._created_dirs:
+            return
+        os.makedirs(parent_dir, exist_ok=True)
+        with cls._created_dirs_lock:
+            cls._created_dirs.add(parent_dir)
+
+    @staticmethod
+    def calculate_local_path(
+        project_path: str, base_path: str, namespace: str, disable_root: bool
+    ) -> str:
+        """Calculate local path for project."""
+        relative_path = project_path.lower()
+
+        if disable_root:
+            root_prefix = namespace.lower() + "/"
+            if relative_path.startswith(root_prefix):
+                relative_path = relative_path[len(root_prefix) :]
+
+        # normpath also converts the "/" separators on Windows
+        return os.path.normpath(os.path.join(base_path, relative_path))
+
+
+class ProjectCache:
+    """Remembers when each project was last synced and at which activity.
+
+    Entries are only valid for the clone options they were written with,
+    so the cache is discarded when those options change.
+    """
+
+    def __init__(self, path: str, options: Optional[Dict[str, object]] = None):
+        """Initialize an empty cache stored at path for the given clone options."""
+        self.path = path
+        self.options = options or {}
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load cached entries, starting empty if the file is missing or invalid."""
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            Logger.warn(f"warning: ignoring unreadable cache {self.path}: {e}")
+            return
+        entries = data.get("projects") if isinstance(data, dict) else None
+        if not isinstance(entries, dict):
+            return
+        if data.get("options") != self.options:
+            Logger.info("clone options changed, syncing every project")
+            return
+        self._entries = {
+            str(key): value
+            for key, value in entries.items()
+            if isinstance(value, dict)
+            and isinstance(value.get("last_activity_at"), str)
+            and isinstance(value.get("synced_at"), str)
+        }
+
+    def save(self) -> None:
+        """Write cached entries atomically, warning if that is not possible."""
+        temp_path = f"{self.path}.tmp"
+        try:
+            with self._lock, open(temp_path, "w", encoding="utf-8") as cache_file:
+                data = {"options": self.options, "projects": self._entries}
+                json.dump(data, cache_file, indent=0, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            Logger.warn(f"warning: could not write cache {self.path}: {e}")
+
+    def is_unchanged(self, project_id: int, last_activity_at: str) -> bool:
+        """Check if a project had no activity since it was last synced.
+
+        GitLab throttles last_activity_at updates, so a push shortly after the
+        recorded activity may not have moved it yet. The timestamp is only
+        trusted if the previous sync started a full throttle interval later.
+        """
+        entry = self._entries.get(str(project_id))
+        if entry is None or entry["last_activity_at"] != last_activity_at:
+            return False
+        try:
+            activity = datetime.fromisoformat(last_activity_at)
+            synced = datetime.fromisoformat(entry["synced_at"])
+            return synced >= activity + ACTIVITY_THROTTLE
+        except (TypeError, ValueError):
+            return False
+
+    def update(
+        self, project_id: int, last_activity_at: str, synced_at: datetime
+    ) -> None:
+        """Record the activity timestamp and start time of a successful sync."""
+        with self._lock:
+            self._entries[str(project_id)] = {
+                "last_activity_at": last_activity_at,
+                "synced_at": synced_at.isoformat(),
+            }
+
+
+class GitLabCloner:
+    """Main class for cloning GitLab repositories."""
+
+    def __init__(self, config: Config):
+        """Initialize GitLab cloner with configuration."""
+        self.config = config
+        self.gitlab_api: Optional[gitlab.Gitlab] = None
+        self.projects: Dict[int, Project] = {}
+        self.sync_options = SyncOptions.from_config(config)
+        self.root_prefix = f"{config.namespace.lower()}/"
+        self.cache = ProjectCache(
+            os.path.join(config.path, CACHE_FILE_NAME),
+            {
+                "depth": config.depth,
+                "clone_filter": config.clone_filter,
+                "recurse_submodules": config.recurse_submodules,
+                "clone_method": config.clone_method.value,
+            },
+        )
+
+    def run(self) -> int:
+        """Execute the cloning process."""
+        try:
+            self._validate_environment()
+            self._initialize_gitlab_api()
+
+            if self.config.dry_run:
+                # Print projects as soon as each listing returns
+                for project in self._iter_projects():
+                    self.projects[project.id] = project
+                    project_path = getattr(project, "path_with_namespace", "unknown")
+                    Logger.info(f"project: {project_path}")
+                Logger.info("dry-run completed")
+                return EXIT_SUCCESS
+
+            if self.config.pipeline:
+                # Start cloning while the remaining groups are still being listed
+                self._process_projects(self._iter_projects())
+            else:
+                self._collect_projects()
+                self._process_projects(self.projects.values())
+            Logger.info("mission accomplished")
+            return EXIT_SUCCESS
+
+        except SystemExit as e:
+            return int(e.code) if isinstance(e.code, int) else EXIT_EXECUTION_ERROR
+        except Exception as e:
+            Logger.error(f"unexpected error: {e}")
+            return EXIT_EXECUTION_ERROR
+
+    def _validate_environment(self) -> None:
+        """Validate environment and requirements."""
+        # Check destination path
+        if not os.path.isdir(self.config.path):
+            Logger.error(f"error: destination path does not exist: {self.config.path}")
+            sys.exit(EXIT_PATH_ERROR)
+        Logger.debug(f"path: {self.config.path}")
+
+        # Check git executable
+        GitOperations.validate_git_available()
+
+        # Check the optional in-process clone backend
+        backend = self.config.git_backend
+        if backend is GitBackend.PYGIT2 and not GitOperations.pygit2_available():
+            Logger.warn("warning: pygit2 not installed, cloning with git")
+
+    def _initialize_gitlab_api(self) -> None:
+        """Initialize GitLab API connection."""
+        Logger.info(f"init gitlab API: {self.config.url}")
+        try:
+            self.gitlab_api = gitlab.Gitlab(
+                url=self.config.url,
+                private_token=self.config.token,
+                session=self._create_session(self.config.jobs),
+            )
+            # Test authentication
+            self.gitlab_api.auth()
+        except gitlab.exceptions.GitlabAuthenticationError as e:
+            Logger.error(f"authentication error: {e}")
+            sys.exit(EXIT_AUTH_ERROR)
+        except Exception as e:
+            Logger.error(f"failed to initialize gitlab API: {e}")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+    @staticmethod
+    def _create_session(jobs: int) -> requests.Session:
+        """Create a pooled keep-alive HTTP session with retries.
+
+        The pool keeps a connection for every concurrent group listing, so
+        paginated requests reuse established TLS connections.
+        """
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2 * jobs,
+            pool_maxsize=2 * jobs,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _collect_projects(self) -> None:
+        """Collect all projects from namespace and subgroups."""
+        self.projects = {project.id: project for project in self._iter_projects()}
+
+    def _iter_projects(self) -> Iterator[Project]:
+        """Yield each project from namespace and subgroups once, as it is found."""
+        if self.config.api is ApiType.GRAPHQL:
+            projects = self._iter_projects_graphql()
+        else:
+            projects = self._iter_projects_rest()
+
+        # A project may be listed more than once, e.g. while pages shift
+        seen: Set[int] = set()
+        for project in projects:
+            if project.id in seen:
+                continue
+            seen.add(project.id)
+
+            if self._is_excluded(project.path_with_namespace):
+                Logger.warn(f"excluding: {project.path_with_namespace}")
+                continue
+            yield project
+
+    def _iter_projects_rest(self) -> Iterator[Project]:
+        """Yield all projects by walking the group tree with the REST API."""
+        Logger.info(f"getting root groups: {self.config.namespace}")
+
+        if self.gitlab_api is None:
+            Logger.error("gitlab API not initialized")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+        try:
+            # Get root group
+            root_group = self.gitlab_api.groups.get(
+                self.config.namespace, lazy=False, include_subgroups=True
+            )
+
+            # Get projects from root group and all subgroups
+            yield from self._iter_tree_projects(root_group)
+
+        except gitlab.exceptions.GitlabGetError as e:
+            Logger.error(f"failed to get namespace '{self.config.namespace}': {e}")
+            sys.exit(EXIT_GITLAB_ERROR)
+        except Exception as e:
+            Logger.error(f"unexpected error while collecting projects: {e}")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+    def _iter_projects_graphql(self) -> Iterator[Project]:
+        """Yield all projects of the namespace tree from paginated GraphQL queries."""
+        Logger.info(f"getting projects via graphql: {self.config.namespace}")
+
+        variables = {"fullPath": self.config.namespace, "after": None}
+        fallback = False
+        try:
+            while True:
+                group = self._graphql_query(GRAPHQL_PROJECTS_QUERY, variables)["group"]
+                if group is None:
+                    Logger.error(f"failed to get namespace '{self.config.namespace}'")
+                    sys.exit(EXIT_GITLAB_ERROR)
+
+                for node in group["projects"]["nodes"]:
+                    # Group project listings cannot filter by visibility here
+                    visibility = self.config.visibility
+                    if visibility and node["visibility"] != visibility:
+                        continue
+
+                    if Logger.VERBOSE:
+                        Logger.debug(f"found: {node['fullPath']}")
+                    yield GraphQLProject(
+                        id=int(node["id"].rsplit("/", 1)[-1]),
+                        path_with_namespace=node["fullPath"],
+                        http_url_to_repo=node["httpUrlToRepo"],
+                        ssh_url_to_repo=node["sshUrlToRepo"],
+                        last_activity_at=node["lastActivityAt"],
+                    )
+
+                page_info = group["projects"]["pageInfo"]
+                if not page_info["hasNextPage"]:
+                    return
+                variables["after"] = page_info["endCursor"]
+
+        except requests.HTTPError as e:
+            # Instances without GraphQL access reject the very first request
+            status = e.response.status_code if e.response is not None else 0
+            if variables["after"] is not None or not 400 <= status < 500:
+                Logger.error(f"graphql error while collecting projects: {e}")
+                sys.exit(EXIT_GITLAB_ERROR)
+            Logger.warn(f"graphql request rejected ({status}), falling back to rest")
+            fallback = True
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            Logger.error(f"graphql error while collecting projects: {e}")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+        if fallback:
+            yield from self._iter_projects_rest()
+
+    def _graphql_query(self, query: str, variables: dict) -> dict:
+        """Run a GraphQL query and return its data, raising on errors."""
+        if self.gitlab_api is None:
+            Logger.error("gitlab API not initialized")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+        response = self.gitlab_api.session.post(
+            f"{self.config.url.rstrip('/')}/api/graphql",
+            json={"query": query, "variables": variables},
+            headers={"Authorization": f"Bearer {self.config.token}"},
+            timeout=self.gitlab_api.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(
+                error.get("message", "") for error in payload["errors"]
+            )
+            raise ValueError(messages)
+        return payload["data"]
+
+    def _iter_group_projects(self, group: object) -> Iterator[Project]:
+        """Yield all projects from a group."""
+        try:
+            options = PROJECT_LIST_OPTIONS
+            if self.config.visibility:
+                # Let GitLab drop projects of other visibility levels
+                options = {**options, "visibility": self.config.visibility}
+            for project in getattr(group, "projects").list(**options):
+                if Logger.VERBOSE:
+                    Logger.debug(f"found: {project.path_with_namespace}")
+                yield project
+        except Exception as e:
+            Logger.error(f"error getting projects from group: {e}")
+            raise
+
+    def _iter_tree_projects(self, root_group: object) -> Iterator[Project]:
+        """Yield projects of the root group and all descendants, listed concurrently."""
+        if self.gitlab_api is None:
+            Logger.error("gitlab API not initialized")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+        jobs = self.config.jobs
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        try:
+            # Root projects are listed by a worker while subgroups are enumerated
+            Logger.info("getting root projects")
+            pending: Set["Future[List[Project]]"] = {
+                executor.submit(lambda: list(self._iter_group_projects(root_group)))
+            }
+            visited = set()
+
+            Logger.info("getting sub-groups")
+
+            # One lazily paginated listing covers the whole subtree, at any depth
+            descendants_manager = getattr(root_group, "descendant_groups", None)
+            subgroups = (
+                descendants_manager.list(**LIST_OPTIONS)
+                if descendants_manager is not None
+                else []
+            )
+
+            for subgroup in subgroups:
+                subgroup_id = getattr(subgroup, "id", None)
+                if subgroup_id is None or subgroup_id in visited:
+                    continue
+
+                visited.add(subgroup_id)
+                subgroup_path = getattr(subgroup, "full_path", "")
+                if self._is_excluded(subgroup_path):
+                    Logger.warn(f"excluding: {subgroup_path}")
+                    continue
+
+                pending.add(executor.submit(self._fetch_group_projects, subgroup_id))
+
+                # Yield finished listings as pages arrive, blocking once about
+                # jobs listings are in flight instead of buffering the tree
+                done, pending = wait(
+                    pending,
+                    timeout=None if len(pending) >= jobs else 0,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    yield from future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        except Exception as e:
+            Logger.error(f"error processing groups: {e}")
+            sys.exit(EXIT_GITLAB_ERROR)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _fetch_group_projects(self, group_id: int) -> List[Project]:
+        """Return all projects of a group."""
+        if self.gitlab_api is None:
+            Logger.error("gitlab API not initialized")
+            sys.exit(EXIT_GITLAB_ERROR)
+
+        # A lazy group needs no request of its own to list its projects
+        group = self.gitlab_api.groups.get(group_id, lazy=True)
+        return list(self._iter_group_projects(group))
+
+    def _is_excluded(self, path: str) -> bool:
+        """Check if a group or project path matches any exclusion pattern.
+
+        Paths are matched below the root namespace, which is never excluded
+        itself, so projects and subgroups are matched the same way.
+        """
+        pattern = self.config.exclude_pattern
+        if pattern is None:
+            return False
+        if path.lower().startswith(self.root_prefix):
+            path = path[len(self.root_prefix) :]
+        return pattern.search(path) is not None
+
+    def _process_projects(self, projects: Iterable[Project]) -> None:
+        """Clone or fetch projects in parallel while they are being produced."""
+        jobs = self.config.jobs
+        work: "queue.Queue[Optional[Project]]" = queue.Queue(maxsize=2 * jobs)
+        failures: List[Tuple[Project, GitError]] = []
+        total = 0
+
+        if self.config.use_cache:
+            # Without loaded entries every project syncs and the cache is rebuilt
+            self.cache.load()
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for _ in range(jobs):
+                    executor.submit(self._process_queue, work, failures)
+                try:
+                    for project in projects:
+                        total += 1
+                        try:
+                            local_path = self._get_local_path(project)
+                        except GitError as e:
+                            failures.append((project, e))
+                            continue
+                        # Create parent directories here so workers never race
+                        PathManager.ensure_parent_directories(local_path)
+                        work.put(project)
+                except BaseException:
+                    # Start no new clones once listing failed or was interrupted
+                    self._drain_queue(work)
+                    raise
+                finally:
+                    # One sentinel per worker, queued after all pending projects
+                    for _ in range(jobs):
+                        work.put(None)
+        except BaseException:
+            self._report_failures(failures, total)
+            raise
+        finally:
+            self.cache.save()
+
+        if failures:
+            self._report_failures(failures, total)
+            sys.exit(max(error.exit_code for _, error in failures))
+
+    @staticmethod
+    def _drain_queue(work: "queue.Queue[Optional[Project]]") -> None:
+        """Drop projects that no worker has started yet."""
+        while True:
+            try:
+                work.get_nowait()
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _report_failures(failures: List[Tuple[Project, GitError]], total: int) -> None:
+        """Log every failed project and a summary line."""
+        if not failures:
+            return
+        for project, error in failures:
+            project_path = getattr(project, "path_with_namespace", "unknown")
+            Logger.error(f"{project_path}: {error}")
+        Logger.error(f"{len(failures)} of {total} projects failed")
+
+    def _process_queue(
+        self,
+        work: "queue.Queue[Optional[Project]]",
+        failures: List[Tuple[Project, GitError]],
+    ) -> None:
+        """Process projects from the work queue until a sentinel is received."""
+        while True:
+            project = work.get()
+            if project is None:
+                return
+            try:
+                self._process_single_project(project)
+            except GitError as e:
+                failures.append((project, e))
+            except Exception as e:
+                failures.append((project, GitError(f"unexpected error: {e}")))
+
+    def _get_local_path(self, project: Project) -> str:
+        """Get local path for a project, raising GitError if it has none."""
+        try:
+            project_path = project.path_with_namespace
+        except AttributeError as e:
+            raise GitError(f"project has no repository attributes: {e}") from e
+        return PathManager.calculate_local_path(
+            project_path,
+            self.config.path,
+            self.config.namespace,
+            self.config.disable_root,
+        )
+
+    def _process_single_project(self, project: Project) -> None:
+        """Process a single project - clone or fetch."""
+        local_path = self._get_local_path(project)
+        try:
+            project_id = project.id
+            project_path = project.path_with_namespace
+            last_activity_at = project.last_activity_at
+            if self.config.clone_method == CloneMethod.SSH:
+                remote_url = project.ssh_url_to_repo
+            else:
+                remote_url = project.http_url_to_repo
+        except AttributeError as e:
+            raise GitError(f"project has no repository attributes: {e}") from e
+
+        # Skip projects without activity since the last successful sync
+        if self.cache.is_unchanged(project_id, last_activity_at) and os.path.isdir(
+            local_path
+        ):
+            Logger.info(f"unchanged: {project_path}")
+            return
+
+        Logger.info(f"processing: {project_path}")
+        if Logger.VERBOSE:
+            Logger.debug(f"remote: {remote_url}")
+            Logger.debug(f"path: {local_path}")
+
+        # Fetch, falling back to clone for new repositories
+        synced_at = datetime.now(timezone.utc)
+        GitOperations.sync_repository(remote_url, local_path, self.sync_options)
+        self.cache.update(project_id, last_activity_at, synced_at)
@@ -0,0 +1,112 @@
+"""
+GitLab Cloner - run configuration.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional, Pattern
+
+# Default number of parallel clone/fetch operations
+DEFAULT_JOBS = min(8, (os.cpu_count() or 1) * 4)
+
+
+class CloneMethod(Enum):
+    """Enumeration for git clone methods."""
+
+    HTTPS = "https"
+    SSH = "ssh"
+
+
+class GitBackend(Enum):
+    """Enumeration for the implementations used to clone repositories."""
+
+    GIT = "git"
+    PYGIT2 = "pygit2"
+
+
+class ApiType(Enum):
+    """Enumeration for GitLab APIs used to list projects."""
+
+    REST = "rest"
+    GRAPHQL = "graphql"
+
+
+@dataclass
+class Config:  # pylint: disable=too-many-instance-attributes
+    """Configuration for GitLab cloner."""
+
+    url: str
+    token: str
+    namespace: str
+    path: str
+    disable_root: bool
+    dry_run: bool
+    exclude: Optional[List[str]]
+    clone_method: CloneMethod = CloneMethod.HTTPS
+    jobs: int = DEFAULT_JOBS
+    depth: int = 1
+    clone_filter: Optional[str] = "blob:none"
+    recurse_submodules: bool = False
+    verbose: bool = False
+    api: ApiType = ApiType.REST
+    timeout: Optional[float] = None
+    pipeline: bool = True
+    use_cache: bool = True
+    git_backend: GitBackend = GitBackend.GIT
+    visibility: Optional[str] = None
+    exclude_pattern: Optional[Pattern[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Compile exclusion patterns into a single substring regex.
+
+        Paths are matched below the root namespace, so a leading namespace
+        is stripped from each pattern and full paths match as well.
+        """
+        if isinstance(self.exclude, str):
+            self.exclude = [self.exclude]
+        if self.exclude:
+            root_prefix = f"{self.namespace.lower()}/"
+            patterns = [
+                (
+                    pattern[len(root_prefix) :]
+                    if pattern.lower().startswith(root_prefix)
+                    and len(pattern) > len(root_prefix)
+                    else pattern
+                )
+                for pattern in self.exclude
+            ]
+            self.exclude_pattern = re.compile("|".join(map(re.escape, patterns)))
+
+
+@dataclass(frozen=True)
+class SyncOptions:
+    """Settings shared by every clone and fetch of a run."""
+
+    depth: int = 0
+    clone_filter: Optional[str] = None
+    recurse_submodules: bool = False
+    timeout: Optional[float] = None
+    git_backend: GitBackend = GitBackend.GIT
+    token: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "SyncOptions":
+        """Build sync options from the run configuration."""
+        return cls(
+            depth=config.depth,
+            clone_filter=config.clone_filter,
+            recurse_submodules=config.recurse_submodules,
+            timeout=config.timeout,
+            git_backend=config.git_backend,
+            token=config.token,
+        )
@@ -0,0 +1,42 @@
+"""
+GitLab Cloner - exit codes and the errors that carry them.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+# Exit codes
+EXIT_SUCCESS = 0
+EXIT_EXECUTION_ERROR = 1
+EXIT_MISSING_ARGUMENTS = 2
+EXIT_PATH_ERROR = 10
+EXIT_GIT_NOT_FOUND = 20
+EXIT_GIT_CLONE_ERROR = 21
+EXIT_GIT_FETCH_ERROR = 22
+EXIT_GITLAB_ERROR = 30
+EXIT_AUTH_ERROR = 40
+
+
+class GitError(Exception):
+    """Base exception for failed git operations."""
+
+    exit_code = EXIT_EXECUTION_ERROR
+
+
+class GitCloneError(GitError):
+    """Raised when git clone fails."""
+
+    exit_code = EXIT_GIT_CLONE_ERROR
+
+
+class GitFetchError(GitError):
+    """Raised when git fetch fails."""
+
+    exit_code = EXIT_GIT_FETCH_ERROR
+
+
+class GitRepositoryMissingError(GitFetchError):
+    """Raised when git fetch finds no repository at the local path."""
@@ -0,0 +1,199 @@
+"""
+GitLab Cloner - git operations on local repositories.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+from gitlab_cloner.config import GitBackend, SyncOptions
+from gitlab_cloner.errors import (
+    EXIT_GIT_NOT_FOUND,
+    GitCloneError,
+    GitFetchError,
+    GitRepositoryMissingError,
+)
+from gitlab_cloner.logger import Logger
+
+try:
+    import pygit2
+except ImportError:  # optional in-process clone backend
+    pygit2 = None
+
+# Git invocation prefix: protocol v2 lets the server filter refs and objects,
+# and the thread settings let git use every CPU for packs, index and submodules
+GIT_COMMAND = [
+    "git",
+    "-c",
+    "protocol.version=2",
+    "-c",
+    "pack.threads=0",
+    "-c",
+    "index.threads=true",
+    "-c",
+    "fetch.parallel=0",
+    "-c",
+    "submodule.fetchJobs=0",
+    "-c",
+    "core.fsmonitor=false",
+]
+
+# Amount of git stderr output kept for error messages
+STDERR_TAIL_BYTES = 8192
+
+# Number of parallel submodule transfers within a single repository
+SUBMODULE_JOBS = os.cpu_count() or 4
+
+
+class GitOperations:
+    """Handles Git operations like clone and fetch."""
+
+    @staticmethod
+    def validate_git_available() -> None:
+        """Validate that git executable is available."""
+        git_executable = shutil.which("git")
+        if git_executable is None:
+            Logger.error("error: git executable not installed or not in $PATH")
+            sys.exit(EXIT_GIT_NOT_FOUND)
+        Logger.debug(f"git: {git_executable}")
+
+    @staticmethod
+    def pygit2_available() -> bool:
+        """Check if the optional pygit2 backend is installed."""
+        return pygit2 is not None
+
+    @staticmethod
+    def clone_repository(
+        remote_url: str, local_path: str, options: SyncOptions = SyncOptions()
+    ) -> None:
+        """Clone a repository, raising GitCloneError on failure.
+
+        A positive depth makes a shallow, single-branch clone; a filter such
+        as blob:none makes a partial clone that downloads blobs on demand.
+        """
+        if Logger.VERBOSE:
+            Logger.debug(f"cloning: {remote_url}")
+        depth = options.depth
+        # libgit2 has no submodule jobs or a way to abort a clone
+        if (
+            options.git_backend is GitBackend.PYGIT2
+            and pygit2 is not None
+            and not options.recurse_submodules
+            and options.timeout is None
+        ):
+            GitOperations._clone_with_pygit2(remote_url, local_path, options)
+            return
+        command = GIT_COMMAND + ["clone"]
+        if depth > 0:
+            command += ["--depth", str(depth), "--single-branch"]
+        if options.clone_filter:
+            command.append(f"--filter={options.clone_filter}")
+        if options.recurse_submodules:
+            command += ["--recurse-submodules", "--jobs", str(SUBMODULE_JOBS)]
+            if depth > 0:
+                command.append("--shallow-submodules")
+        command += [remote_url, local_path]
+        try:
+            returncode, stderr = GitOperations._run(command, options.timeout)
+        except subprocess.TimeoutExpired as e:
+            # Drop the partial clone so the next run starts from scratch
+            shutil.rmtree(local_path, ignore_errors=True)
+            raise GitCloneError(
+                f"git clone timed out after {options.timeout:g}s"
+            ) from e
+        except OSError as e:
+            raise GitCloneError(f"unexpected error while cloning: {e}") from e
+        if returncode != 0:
+            raise GitCloneError(f"git clone failed: {stderr}")
+
+    @staticmethod
+    def _clone_with_pygit2(
+        remote_url: str, local_path: str, options: SyncOptions
+    ) -> None:
+        """Clone a repository in-process with libgit2, avoiding a git process.
+
+        libgit2 has no partial clones, so the blob filter is not applied.
+        """
+        if remote_url.startswith(("https://", "http://")):
+            credentials = pygit2.UserPass("oauth2", options.token)
+        else:
+            credentials = pygit2.KeypairFromAgent("git")
+        try:
+            pygit2.clone_repository(
+                remote_url,
+                local_path,
+                depth=options.depth,
+                callbacks=pygit2.RemoteCallbacks(credentials=credentials),
+            )
+        except (pygit2.GitError, ValueError, OSError) as e:
+            # Drop the partial clone so the next run starts from scratch
+            shutil.rmtree(local_path, ignore_errors=True)
+            raise GitCloneError(f"pygit2 clone failed: {e}") from e
+
+    @staticmethod
+    def fetch_repository(local_path: str, options: SyncOptions = SyncOptions()) -> None:
+        """Fetch updates for existing repository, raising GitFetchError on failure.
+
+        Shallow repositories are kept at the given depth, or unshallowed when
+        depth is 0. Complete repositories are never made shallow.
+        """
+        if Logger.VERBOSE:
+            Logger.debug(f"fetching: {local_path}")
+        command = GIT_COMMAND + ["-C", local_path, "fetch", "--all"]
+        if os.path.isfile(os.path.join(local_path, ".git", "shallow")):
+            depth = options.depth
+            command.append(f"--depth={depth}" if depth > 0 else "--unshallow")
+        if options.recurse_submodules:
+            command += ["--recurse-submodules", "--jobs", str(SUBMODULE_JOBS)]
+        try:
+            returncode, stderr = GitOperations._run(command, options.timeout)
+        except subprocess.TimeoutExpired as e:
+            raise GitFetchError(
+                f"git fetch timed out after {options.timeout:g}s"
+            ) from e
+        except OSError as e:
+            raise GitFetchError(f"unexpected error while fetching: {e}") from e
+        if returncode != 0:
+            message = f"git fetch failed: {stderr}"
+            if "not a git repository" in stderr or not os.path.isdir(local_path):
+                raise GitRepositoryMissingError(message)
+            raise GitFetchError(message)
+
+    @staticmethod
+    def _run(command: List[str], timeout: Optional[float] = None) -> Tuple[int, str]:
+        """Run a git command, returning its exit code and the tail of stderr.
+
+        A command exceeding the timeout is killed and reaped before
+        subprocess.TimeoutExpired is raised.
+        """
+        result = subprocess.run(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
+            timeout=timeout,
+            # Fail instead of blocking a worker on a credentials prompt
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+        if result.returncode == 0:
+            return 0, ""
+        stderr = result.stderr[-STDERR_TAIL_BYTES:].decode("utf-8", errors="replace")
+        return result.returncode, stderr.strip()
+
+    @staticmethod
+    def sync_repository(
+        remote_url: str, local_path: str, options: SyncOptions = SyncOptions()
+    ) -> None:
+        """Fetch a repository, cloning it when it does not exist locally."""
+        try:
+            GitOperations.fetch_repository(local_path, options)
+        except GitRepositoryMissingError:
+            GitOperations.clone_repository(remote_url, local_path, options)
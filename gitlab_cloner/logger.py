@@ -0,0 +1,71 @@
+"""
+GitLab Cloner - console output.
+
+Copyright (c) 2025 Michele Tavella <meeghele@proton.me>
+Licensed under the MIT License. See LICENSE file for details.
+
+Author: Michele Tavella <meeghele@proton.me>
+License: MIT
+"""
+
+import os
+import sys
+
+import colorama
+
+
+def _supports_color() -> bool:
+    """Check if stdout is a terminal and the NO_COLOR convention is not set."""
+    return sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
+# Color only interactive output, so redirected logs skip the colorama wrapper
+USE_COLOR = _supports_color()
+if USE_COLOR:
+    # Initialize colorama for cross-platform colored output
+    colorama.init(autoreset=True)
+
+
+class Logger:
+    """Handles formatted console output with colors."""
+
+    PROCESS_NAME = "gitlab-cloner"
+    VERBOSE = False
+
+    # Colored headers are formatted once per process rather than per line
+    _HEADER = f"[{PROCESS_NAME}:{os.getpid()}]"
+    if USE_COLOR:
+        _DEBUG_PREFIX = (
+            f"{colorama.Fore.LIGHTBLACK_EX}{_HEADER}{colorama.Style.RESET_ALL} "
+        )
+        _INFO_PREFIX = f"{colorama.Fore.BLUE}{_HEADER}{colorama.Style.RESET_ALL} "
+        _WARN_PREFIX = f"{colorama.Fore.YELLOW}{_HEADER}{colorama.Style.RESET_ALL} "
+        _ERROR_PREFIX = f"{colorama.Fore.RED}{_HEADER}{colorama.Style.RESET_ALL} "
+    else:
+        _DEBUG_PREFIX = _INFO_PREFIX = _WARN_PREFIX = _ERROR_PREFIX = f"{_HEADER} "
+
+    @classmethod
+    def debug(cls, *messages: str) -> None:
+        """Print debug message in gray when verbose output is enabled."""
+        if cls.VERBOSE:
+            sys.stdout.write(cls._format_line(cls._DEBUG_PREFIX, *messages))
+
+    @classmethod
+    def info(cls, *messages: str) -> None:
+        """Print info message in blue."""
+        sys.stdout.write(cls._format_line(cls._INFO_PREFIX, *messages))
+
+    @classmethod
+    def warn(cls, *messages: str) -> None:
+        """Print warning message in yellow."""
+        sys.stdout.write(cls._format_line(cls._WARN_PREFIX, *messages))
+
+    @classmethod
+    def error(cls, *messages: str) -> None:
+        """Print error message in red to stderr."""
+        sys.stderr.write(cls._format_line(cls._ERROR_PREFIX, *messages))
+
+    @staticmethod
+    def _format_line(prefix: str, *messages: str) -> str:
+        """Format a line with its colored header prefix."""
+        return prefix + " ".join(map(str, messages)) + "\n"
@@ -10,12 +10,57 @@ Author: Michele Tavella <meeghele@proton.me>
 
 import os
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock
 from typing import Dict, List, Any
 
 import pytest
 import gitlab
 
+import gitlab_cloner
+
+
+@pytest.fixture(scope="session")
+def gc():
+    """Provide the gitlab_cloner package under test."""
+    return gitlab_cloner
+
+
+@pytest.fixture
+def base_config(gc):
+    """Provide a default configuration; derive variants with dataclasses.replace."""
+    return gc.Config(
+        url='https://gitlab.com',
+        token='test-token',
+        namespace='test-ns',
+        path='/test/path',
+        disable_root=False,
+        dry_run=False,
+        exclude=None
+    )
+
+
+@pytest.fixture
+def cloner(gc, base_config):
+    """Provide a GitLabCloner built from the default configuration."""
+    return gc.GitLabCloner(base_config)
+
+
+@pytest.fixture
+def patched_env(gc, monkeypatch):
+    """Stub the destination check, git lookup, and GitLab client; tests may override."""
+    env = SimpleNamespace(
+        isdir=Mock(return_value=True),
+        validate_git_available=Mock(),
+        gitlab_class=MagicMock(),
+    )
+    monkeypatch.setattr('os.path.isdir', env.isdir)
+    monkeypatch.setattr(
+        gc.GitOperations, 'validate_git_available', env.validate_git_available
+    )
+    monkeypatch.setattr('gitlab.Gitlab', env.gitlab_class)
+    return env
+
 
 @pytest.fixture
 def temp_dir():
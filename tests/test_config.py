@@ -9,18 +9,17 @@ Author: Michele Tavella <meeghele@proton.me>
 """
 
 import os
+import subprocess
 import sys
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, Mock
 import pytest
 
-# Add the parent directory to sys.path to import the module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gitlab_cloner as gc
 
-# Import the module under test
-import importlib.util
-spec = importlib.util.spec_from_file_location("gitlab_cloner", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gitlab-cloner.py"))
-gc = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(gc)
+# Sync start time well past the throttle interval of the cached activity
+SYNCED_AT = datetime(2025, 1, 1, 2, tzinfo=timezone.utc)
 
 
 class TestConfig:
@@ -35,7 +34,7 @@ class TestConfig:
             path='/test/path',
             disable_root=False,
             dry_run=False,
-            exclude='repo1',
+            exclude=['repo1'],
             clone_method=gc.CloneMethod.SSH
         )
         
@@ -45,9 +44,55 @@ class TestConfig:
         assert config.path == '/test/path'
         assert config.disable_root is False
         assert config.dry_run is False
-        assert config.exclude == 'repo1'
+        assert config.exclude == ['repo1']
         assert config.clone_method == gc.CloneMethod.SSH
     
+    def test_config_exclude_pattern(self):
+        """Test exclusion patterns compile into one escaped regex."""
+        config = gc.Config(
+            url='https://gitlab.com',
+            token='test-token',
+            namespace='test-ns',
+            path='/test/path',
+            disable_root=False,
+            dry_run=False,
+            exclude=['archived', 'a.b']
+        )
+
+        assert config.exclude_pattern.search('test-ns/archived/repo')
+        assert config.exclude_pattern.search('test-ns/a.b')
+        assert not config.exclude_pattern.search('test-ns/axb')
+
+    def test_config_exclude_full_path(self):
+        """Test a pattern starting with the namespace matches below it."""
+        config = gc.Config(
+            url='https://gitlab.com',
+            token='test-token',
+            namespace='test-ns',
+            path='/test/path',
+            disable_root=False,
+            dry_run=False,
+            exclude=['Test-NS/archived']
+        )
+
+        assert config.exclude == ['Test-NS/archived']
+        assert config.exclude_pattern.pattern == 'archived'
+
+    def test_config_exclude_string(self):
+        """Test a single exclusion string is treated as one pattern."""
+        config = gc.Config(
+            url='https://gitlab.com',
+            token='test-token',
+            namespace='test-ns',
+            path='/test/path',
+            disable_root=False,
+            dry_run=False,
+            exclude='repo1'
+        )
+
+        assert config.exclude == ['repo1']
+        assert not config.exclude_pattern.search('test-ns/other')
+
     def test_config_defaults(self):
         """Test Config with defaults."""
         config = gc.Config(
@@ -61,9 +106,21 @@ class TestConfig:
         )
 
         assert config.exclude is None
+        assert config.exclude_pattern is None
         assert config.disable_root is False
         assert config.dry_run is False
         assert config.clone_method == gc.CloneMethod.HTTPS  # default value
+        assert config.jobs == gc.DEFAULT_JOBS
+        assert config.depth == 1
+        assert config.clone_filter == 'blob:none'
+        assert config.recurse_submodules is False
+        assert config.verbose is False
+        assert config.api == gc.ApiType.REST
+        assert config.timeout is None
+        assert config.pipeline is True
+        assert config.use_cache is True
+        assert config.git_backend == gc.GitBackend.GIT
+        assert config.visibility is None
 
 
 class TestArgumentParsing:
@@ -88,6 +145,16 @@ class TestArgumentParsing:
         assert config.dry_run is False
         assert config.disable_root is False
         assert config.clone_method == gc.CloneMethod.HTTPS  # default
+        assert config.api == gc.ApiType.REST  # default
+
+    def test_parse_args_use_graphql_alias(self):
+        """Test --use-graphql selects the GraphQL API."""
+        args = ['--token', 'test-token', '--namespace', 'test-ns', '--use-graphql']
+
+        with patch('sys.argv', ['gitlab-cloner.py'] + args):
+            config = gc.parse_arguments()
+
+        assert config.api == gc.ApiType.GRAPHQL
     
     def test_parse_args_all_options(self):
         """Test parsing all available arguments."""
@@ -97,9 +164,19 @@ class TestArgumentParsing:
             '--namespace', 'test-ns',
             '--path', '/test/path',
             '--exclude', 'repo1',
+            '--exclude', 'repo2',
             '--dry-run',
             '--disable-root',
-            '--clone-method', 'ssh'
+            '--clone-method', 'ssh',
+            '--jobs', '4',
+            '--depth', '5',
+            '--recurse-submodules',
+            '--verbose',
+            '--api', 'graphql',
+            '--timeout', '600',
+            '--no-pipeline',
+            '--no-cache',
+            '--visibility', 'public'
         ]
         
         with patch('sys.argv', ['gitlab-cloner.py'] + args):
@@ -109,10 +186,76 @@ class TestArgumentParsing:
         assert config.token == 'test-token'
         assert config.namespace == 'test-ns'
         assert config.path == '/test/path'
-        assert config.exclude == 'repo1'
+        assert config.exclude == ['repo1', 'repo2']
         assert config.dry_run is True
         assert config.disable_root is True
         assert config.clone_method == gc.CloneMethod.SSH
+        assert config.jobs == 4
+        assert config.depth == 5
+        assert config.recurse_submodules is True
+        assert config.verbose is True
+        assert config.api == gc.ApiType.GRAPHQL
+        assert config.timeout == 600
+        assert config.pipeline is False
+        assert config.use_cache is False
+        assert config.visibility == 'public'
+
+    def test_parse_args_full_history(self):
+        """Test --full-history disables shallow cloning."""
+        args = [
+            '--token', 'test-token',
+            '--namespace', 'test-ns',
+            '--full-history'
+        ]
+
+        with patch('sys.argv', ['gitlab-cloner.py'] + args):
+            config = gc.parse_arguments()
+
+        assert config.depth == 0
+        assert config.clone_filter == 'blob:none'
+
+    def test_parse_args_full_clone(self):
+        """Test --full-clone disables both shallow and partial cloning."""
+        args = [
+            '--token', 'test-token',
+            '--namespace', 'test-ns',
+            '--full-clone'
+        ]
+
+        with patch('sys.argv', ['gitlab-cloner.py'] + args):
+            config = gc.parse_arguments()
+
+        assert config.depth == 0
+        assert config.clone_filter is None
+
+    def test_parse_args_pygit2_backend(self):
+        """Test the pygit2 backend keeps the blob filter for git fallbacks."""
+        args = [
+            '--token', 'test-token',
+            '--namespace', 'test-ns',
+            '--git-backend', 'pygit2'
+        ]
+
+        with patch('sys.argv', ['gitlab-cloner.py'] + args):
+            config = gc.parse_arguments()
+
+        assert config.git_backend == gc.GitBackend.PYGIT2
+        assert config.depth == 1
+        assert config.clone_filter == 'blob:none'
+
+    def test_parse_args_invalid_jobs(self):
+        """Test parsing rejects a non-positive job count."""
+        args = [
+            '--token', 'test-token',
+            '--namespace', 'test-ns',
+            '--jobs', '0'
+        ]
+
+        with patch('sys.argv', ['gitlab-cloner.py'] + args):
+            with pytest.raises(SystemExit) as exc_info:
+                gc.parse_arguments()
+
+        assert exc_info.value.code == gc.EXIT_MISSING_ARGUMENTS
     
     @patch.dict(os.environ, {'GITLAB_TOKEN': 'env-token'})
     def test_token_from_environment(self):
@@ -145,12 +288,20 @@ class TestArgumentParsing:
 class TestLogger:
     """Test Logger class functionality."""
     
-    def test_logger_debug(self, capsys):
+    def test_logger_debug(self, capsys, monkeypatch):
         """Test Logger.debug method."""
+        monkeypatch.setattr(gc.Logger, "VERBOSE", True)
         gc.Logger.debug("debug message")
         
         captured = capsys.readouterr()
         assert "debug message" in captured.out
+
+    def test_logger_debug_silent_by_default(self, capsys):
+        """Test Logger.debug prints nothing unless verbose."""
+        gc.Logger.debug("debug message")
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
     
     def test_logger_info(self, capsys):
         """Test Logger.info method."""
@@ -166,6 +317,26 @@ class TestLogger:
         captured = capsys.readouterr()
         assert "warning message" in captured.out
     
+    def test_logger_header(self, capsys):
+        """Test log lines carry the process name and PID header."""
+        gc.Logger.info("info message")
+
+        captured = capsys.readouterr()
+        assert f"[gitlab-cloner:{os.getpid()}]" in captured.out
+        assert captured.out.endswith("info message\n")
+
+    def test_supports_color_requires_tty(self, monkeypatch):
+        """Test colors are disabled when stdout is not a terminal."""
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: False)
+        assert gc.logger._supports_color() is False
+
+    def test_supports_color_honors_no_color(self, monkeypatch):
+        """Test colors are disabled when NO_COLOR is set."""
+        monkeypatch.setenv("NO_COLOR", "1")
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        assert not gc.logger._supports_color()
+
     def test_logger_error(self, capsys):
         """Test Logger.error method."""
         gc.Logger.error("error message")
@@ -201,6 +372,18 @@ class TestPathManager:
         expected = os.path.normpath("/repos/myproject")
         assert result == expected
     
+    def test_calculate_local_path_disable_nested_root(self):
+        """Test disable_root strips a nested namespace and is case-insensitive."""
+        result = gc.PathManager.calculate_local_path(
+            project_path="MyGroup/Team/sub/myproject",
+            base_path="/repos",
+            namespace="mygroup/team",
+            disable_root=True
+        )
+
+        expected = os.path.normpath("/repos/sub/myproject")
+        assert result == expected
+
     def test_ensure_parent_directories(self, tmp_path):
         """Test parent directory creation."""
         test_file_path = tmp_path / "subdir" / "file.txt"
@@ -210,6 +393,73 @@ class TestPathManager:
         assert test_file_path.parent.exists()
         assert test_file_path.parent.is_dir()
 
+    def test_ensure_parent_directories_cached(self, tmp_path):
+        """Test a parent directory is only created once per process."""
+        parent = tmp_path / "group"
+
+        with patch('os.makedirs') as mock_makedirs:
+            gc.PathManager.ensure_parent_directories(str(parent / "repo1"))
+            gc.PathManager.ensure_parent_directories(str(parent / "repo2"))
+
+        mock_makedirs.assert_called_once_with(str(parent), exist_ok=True)
+
+
+class TestProjectCache:
+    """Test ProjectCache persistence."""
+
+    def test_round_trip(self, tmp_path):
+        """Test entries survive a save and load."""
+        cache_path = str(tmp_path / gc.CACHE_FILE_NAME)
+        cache = gc.ProjectCache(cache_path)
+        cache.update(1, '2025-01-01T00:00:00Z', SYNCED_AT)
+        cache.save()
+
+        reloaded = gc.ProjectCache(cache_path)
+        reloaded.load()
+
+        assert reloaded.is_unchanged(1, '2025-01-01T00:00:00Z')
+        assert not reloaded.is_unchanged(1, '2025-02-01T00:00:00Z')
+        assert not reloaded.is_unchanged(2, '2025-01-01T00:00:00Z')
+
+    def test_synced_within_throttle_interval(self, tmp_path):
+        """Test a sync less than an hour after the last activity is not trusted."""
+        cache = gc.ProjectCache(str(tmp_path / gc.CACHE_FILE_NAME))
+        activity = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        # A push after this sync may not have moved last_activity_at yet
+        cache.update(1, '2025-01-01T00:00:00Z', activity + timedelta(minutes=30))
+        assert not cache.is_unchanged(1, '2025-01-01T00:00:00Z')
+
+        cache.update(1, '2025-01-01T00:00:00Z', activity + gc.ACTIVITY_THROTTLE)
+        assert cache.is_unchanged(1, '2025-01-01T00:00:00Z')
+
+    def test_load_ignores_invalid_file(self, tmp_path, capsys):
+        """Test an unreadable cache is ignored with a warning."""
+        cache_path = tmp_path / gc.CACHE_FILE_NAME
+        cache_path.write_text('not json')
+
+        cache = gc.ProjectCache(str(cache_path))
+        cache.load()
+
+        assert not cache.is_unchanged(1, '2025-01-01T00:00:00Z')
+        assert 'ignoring unreadable cache' in capsys.readouterr().out
+
+    def test_load_discards_other_clone_options(self, tmp_path, capsys):
+        """Test entries written with different clone options are discarded."""
+        cache_path = str(tmp_path / gc.CACHE_FILE_NAME)
+        cache = gc.ProjectCache(cache_path, {'depth': 1, 'clone_filter': 'blob:none'})
+        cache.update(1, '2025-01-01T00:00:00Z', SYNCED_AT)
+        cache.save()
+
+        same = gc.ProjectCache(cache_path, {'depth': 1, 'clone_filter': 'blob:none'})
+        same.load()
+        changed = gc.ProjectCache(cache_path, {'depth': 0, 'clone_filter': 'blob:none'})
+        changed.load()
+
+        assert same.is_unchanged(1, '2025-01-01T00:00:00Z')
+        assert not changed.is_unchanged(1, '2025-01-01T00:00:00Z')
+        assert 'clone options changed' in capsys.readouterr().out
+
 
 class TestGitOperations:
     """Test GitOperations class functionality."""
@@ -243,15 +493,191 @@ class TestGitOperations:
         mock_run.assert_called_once()
     
     @patch('subprocess.run')
-    @patch('sys.exit')
-    def test_clone_repository_failure(self, mock_exit, mock_run):
+    def test_clone_repository_shallow(self, mock_run):
+        """Test shallow clone flags are passed to git."""
+        mock_run.return_value.returncode = 0
+
+        gc.GitOperations.clone_repository(
+            'https://example.com/repo.git',
+            '/local/path',
+            gc.SyncOptions(depth=1, clone_filter='blob:none'),
+        )
+
+        assert mock_run.call_args[0][0] == gc.GIT_COMMAND + [
+            'clone', '--depth', '1', '--single-branch', '--filter=blob:none',
+            'https://example.com/repo.git', '/local/path'
+        ]
+
+    @patch('subprocess.run')
+    def test_clone_uses_shallow_flags(self, mock_run, base_config):
+        """Test the default configuration makes a shallow, blobless clone."""
+        mock_run.return_value.returncode = 0
+
+        gc.GitOperations.clone_repository(
+            'https://example.com/repo.git',
+            '/local/path',
+            gc.SyncOptions.from_config(base_config),
+        )
+
+        command = mock_run.call_args[0][0]
+        assert command[command.index('--depth') + 1] == '1'
+        assert '--filter=blob:none' in command
+
+    @patch('subprocess.run')
+    def test_clone_repository_parallel_config(self, mock_run):
+        """Test git runs with parallel settings and without terminal prompts."""
+        mock_run.return_value.returncode = 0
+
+        gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
+
+        command = mock_run.call_args[0][0]
+        for setting in (
+            'protocol.version=2', 'pack.threads=0', 'index.threads=true',
+            'fetch.parallel=0', 'submodule.fetchJobs=0', 'core.fsmonitor=false',
+        ):
+            assert command[command.index(setting) - 1] == '-c'
+        assert command.index('clone') > command.index('core.fsmonitor=false')
+        assert mock_run.call_args.kwargs['env']['GIT_TERMINAL_PROMPT'] == '0'
+
+    @patch('subprocess.run')
+    def test_clone_prefers_pygit2_when_available(self, mock_run, monkeypatch):
+        """Test the pygit2 backend clones in-process without running git."""
+        mock_pygit2 = Mock()
+        monkeypatch.setattr('gitlab_cloner.git.pygit2', mock_pygit2)
+        options = gc.SyncOptions(
+            depth=1,
+            clone_filter='blob:none',
+            git_backend=gc.GitBackend.PYGIT2,
+            token='test-token',
+        )
+
+        gc.GitOperations.clone_repository(
+            'https://example.com/repo.git', '/local/path', options
+        )
+
+        mock_pygit2.clone_repository.assert_called_once_with(
+            'https://example.com/repo.git',
+            '/local/path',
+            depth=1,
+            callbacks=mock_pygit2.RemoteCallbacks.return_value,
+        )
+        mock_pygit2.UserPass.assert_called_once_with('oauth2', 'test-token')
+        mock_run.assert_not_called()
+
+    @pytest.mark.parametrize('installed, timeout, recurse_submodules', [
+        (False, None, False),
+        (True, 30, False),
+        (True, None, True),
+    ])
+    @patch('subprocess.run')
+    def test_clone_pygit2_falls_back_to_git(
+        self, mock_run, monkeypatch, installed, timeout, recurse_submodules
+    ):
+        """Test git fallbacks of the pygit2 backend keep the blob filter."""
+        mock_run.return_value.returncode = 0
+        mock_pygit2 = Mock()
+        monkeypatch.setattr('gitlab_cloner.git.pygit2', mock_pygit2 if installed else None)
+        options = gc.SyncOptions(
+            depth=1,
+            clone_filter='blob:none',
+            recurse_submodules=recurse_submodules,
+            timeout=timeout,
+            git_backend=gc.GitBackend.PYGIT2,
+            token='test-token',
+        )
+
+        gc.GitOperations.clone_repository(
+            'https://example.com/repo.git', '/local/path', options
+        )
+
+        mock_pygit2.clone_repository.assert_not_called()
+        assert '--filter=blob:none' in mock_run.call_args[0][0]
+
+    def test_sync_options_hide_token(self, base_config):
+        """Test sync options carry the backend and token without printing it."""
+        options = gc.SyncOptions.from_config(
+            replace(base_config, git_backend=gc.GitBackend.PYGIT2)
+        )
+
+        assert options.git_backend == gc.GitBackend.PYGIT2
+        assert options.token == 'test-token'
+        assert 'test-token' not in repr(options)
+
+    @patch('subprocess.run')
+    def test_clone_repository_full(self, mock_run):
+        """Test a full clone passes neither depth nor filter."""
+        mock_run.return_value.returncode = 0
+
+        gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
+
+        command = mock_run.call_args[0][0]
+        assert '--depth' not in command
+        assert not any(arg.startswith('--filter') for arg in command)
+
+    @patch('subprocess.run')
+    def test_clone_repository_submodules(self, mock_run):
+        """Test submodules are cloned in parallel when requested."""
+        mock_run.return_value.returncode = 0
+
+        gc.GitOperations.clone_repository(
+            'https://example.com/repo.git',
+            '/local/path',
+            gc.SyncOptions(depth=1, recurse_submodules=True),
+        )
+
+        command = mock_run.call_args[0][0]
+        assert '--recurse-submodules' in command
+        assert '--shallow-submodules' in command
+        assert command[command.index('--jobs') + 1] == str(gc.SUBMODULE_JOBS)
+
+    @patch('subprocess.run')
+    def test_clone_repository_failure(self, mock_run):
         """Test repository cloning failure."""
         mock_run.return_value.returncode = 1
-        mock_run.return_value.stderr = 'Clone failed'
+        mock_run.return_value.stderr = b'Clone failed'
         
-        gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
+        with pytest.raises(gc.GitCloneError, match='Clone failed') as exc_info:
+            gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
         
-        mock_exit.assert_called_once_with(gc.EXIT_GIT_CLONE_ERROR)
+        assert exc_info.value.exit_code == gc.EXIT_GIT_CLONE_ERROR
+
+    @patch('subprocess.run')
+    def test_clone_repository_keeps_stderr_tail(self, mock_run):
+        """Test only the end of git's stderr is kept and stdout is discarded."""
+        mock_run.return_value.returncode = 128
+        mock_run.return_value.stderr = b'x' * gc.STDERR_TAIL_BYTES + b'fatal: \xff denied'
+
+        with pytest.raises(gc.GitCloneError) as exc_info:
+            gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
+
+        message = str(exc_info.value)
+        assert message.endswith('fatal: \ufffd denied')
+        assert len(message) <= gc.STDERR_TAIL_BYTES + len('git clone failed: ')
+        assert mock_run.call_args.kwargs['stdout'] == subprocess.DEVNULL
+        assert mock_run.call_args.kwargs['stderr'] == subprocess.PIPE
+
+    @patch('subprocess.run')
+    def test_clone_repository_timeout(self, mock_run, tmp_path):
+        """Test a timed out clone is reported and its partial checkout removed."""
+        local_path = tmp_path / 'repo'
+        local_path.mkdir()
+        mock_run.side_effect = subprocess.TimeoutExpired(['git', 'clone'], 5)
+
+        with pytest.raises(gc.GitCloneError, match='timed out after 5s'):
+            gc.GitOperations.clone_repository(
+                'https://example.com/repo.git', str(local_path), gc.SyncOptions(timeout=5)
+            )
+
+        assert mock_run.call_args.kwargs['timeout'] == 5
+        assert not local_path.exists()
+
+    @patch('subprocess.run')
+    def test_clone_repository_os_error(self, mock_run):
+        """Test cloning failure when git cannot be executed."""
+        mock_run.side_effect = OSError('exec failed')
+
+        with pytest.raises(gc.GitCloneError, match='exec failed'):
+            gc.GitOperations.clone_repository('https://example.com/repo.git', '/local/path')
     
     @patch('subprocess.run')
     def test_fetch_repository_success(self, mock_run):
@@ -263,13 +689,60 @@ class TestGitOperations:
         
         mock_run.assert_called_once()
     
+    @pytest.mark.parametrize('depth, expected', [(1, '--depth=1'), (0, '--unshallow')])
     @patch('subprocess.run')
-    @patch('sys.exit')
-    def test_fetch_repository_failure(self, mock_exit, mock_run):
+    def test_fetch_repository_shallow(self, mock_run, depth, expected, tmp_path):
+        """Test shallow repositories keep their depth or get unshallowed."""
+        mock_run.return_value.returncode = 0
+        (tmp_path / '.git').mkdir()
+        (tmp_path / '.git' / 'shallow').touch()
+
+        gc.GitOperations.fetch_repository(str(tmp_path), gc.SyncOptions(depth=depth))
+
+        assert mock_run.call_args[0][0] == gc.GIT_COMMAND + [
+            '-C', str(tmp_path), 'fetch', '--all', expected
+        ]
+
+    @patch('subprocess.run')
+    def test_fetch_repository_failure(self, mock_run):
         """Test repository fetching failure."""
         mock_run.return_value.returncode = 1
-        mock_run.return_value.stderr = 'Fetch failed'
+        mock_run.return_value.stderr = b'Fetch failed'
         
-        gc.GitOperations.fetch_repository('/local/path')
+        with pytest.raises(gc.GitFetchError, match='Fetch failed') as exc_info:
+            gc.GitOperations.fetch_repository('/local/path')
         
-        mock_exit.assert_called_once_with(gc.EXIT_GIT_FETCH_ERROR)
\ No newline at end of file
+        assert exc_info.value.exit_code == gc.EXIT_GIT_FETCH_ERROR
+
+    @patch('subprocess.run')
+    def test_fetch_repository_missing(self, mock_run, tmp_path):
+        """Test fetching a missing repository raises GitRepositoryMissingError."""
+        mock_run.return_value.returncode = 128
+        mock_run.return_value.stderr = b"fatal: cannot change to 'missing'"
+
+        with pytest.raises(gc.GitRepositoryMissingError):
+            gc.GitOperations.fetch_repository(str(tmp_path / 'missing'))
+
+    @patch.object(gc.GitOperations, 'clone_repository')
+    @patch.object(gc.GitOperations, 'fetch_repository')
+    def test_sync_repository_fetches_existing(self, mock_fetch, mock_clone):
+        """Test sync fetches a repository that already exists."""
+        options = gc.SyncOptions(depth=1)
+
+        gc.GitOperations.sync_repository('https://example.com/repo.git', '/local/path', options)
+
+        mock_fetch.assert_called_once_with('/local/path', options)
+        mock_clone.assert_not_called()
+
+    @patch.object(gc.GitOperations, 'clone_repository')
+    @patch.object(gc.GitOperations, 'fetch_repository')
+    def test_sync_repository_clones_missing(self, mock_fetch, mock_clone):
+        """Test sync falls back to clone when the repository is missing."""
+        mock_fetch.side_effect = gc.GitRepositoryMissingError('missing')
+        options = gc.SyncOptions(depth=1)
+
+        gc.GitOperations.sync_repository('https://example.com/repo.git', '/local/path', options)
+
+        mock_clone.assert_called_once_with(
+            'https://example.com/repo.git', '/local/path', options
+        )
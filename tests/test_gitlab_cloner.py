@@ -10,256 +10,741 @@ Author: Michele Tavella <meeghele@proton.me>
 
 import os
 import sys
-from unittest.mock import patch, Mock, MagicMock
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import ANY, patch, Mock, MagicMock
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
 
-# Add the parent directory to sys.path to import the module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Import the module under test
-import importlib.util
-spec = importlib.util.spec_from_file_location("gitlab_cloner", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gitlab-cloner.py"))
-gc = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(gc)
+import gitlab_cloner as gc
 
 
 class TestGitLabCloner:
     """Test GitLabCloner main class."""
     
-    def test_init(self):
+    def test_init(self, base_config):
         """Test GitLabCloner initialization."""
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token', 
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
-        )
-        
-        cloner = gc.GitLabCloner(config)
+        cloner = gc.GitLabCloner(base_config)
         
-        assert cloner.config == config
+        assert cloner.config == base_config
         assert cloner.gitlab_api is None
-        assert cloner.projects == []
+        assert cloner.projects == {}
     
-    @patch('os.path.isdir')
-    @patch.object(gc.GitOperations, 'validate_git_available')
-    @patch('gitlab.Gitlab')
-    def test_validate_environment_success(self, mock_gitlab_class, mock_validate_git, mock_isdir):
+    def test_validate_environment_success(self, cloner, patched_env):
         """Test successful environment validation."""
-        mock_isdir.return_value = True
-        
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns', 
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
-        )
-        
-        cloner = gc.GitLabCloner(config)
-        
         # Should not raise exception
         cloner._validate_environment()
         
-        mock_isdir.assert_called_once_with('/test/path')
-        mock_validate_git.assert_called_once()
+        patched_env.isdir.assert_called_once_with('/test/path')
+        patched_env.validate_git_available.assert_called_once()
     
-    @patch('os.path.isdir')
-    @patch('sys.exit')
-    def test_validate_environment_path_not_exists(self, mock_exit, mock_isdir):
+    def test_validate_environment_path_not_exists(self, base_config, patched_env):
         """Test environment validation with invalid path."""
-        mock_isdir.return_value = False
+        patched_env.isdir.return_value = False
         
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/nonexistent/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
-        )
+        config = replace(base_config, path='/nonexistent/path')
         
         cloner = gc.GitLabCloner(config)
-        cloner._validate_environment()
+        with pytest.raises(SystemExit) as exc_info:
+            cloner._validate_environment()
         
-        mock_exit.assert_called_once_with(gc.EXIT_PATH_ERROR)
+        assert exc_info.value.code == gc.EXIT_PATH_ERROR
     
-    @patch('gitlab.Gitlab')
-    def test_initialize_gitlab_api_success(self, mock_gitlab_class):
+    def test_validate_environment_pygit2_missing(
+        self, base_config, patched_env, monkeypatch, capsys
+    ):
+        """Test the pygit2 backend falls back to git when it is not installed."""
+        monkeypatch.setattr('gitlab_cloner.git.pygit2', None)
+        config = replace(base_config, git_backend=gc.GitBackend.PYGIT2)
+
+        gc.GitLabCloner(config)._validate_environment()
+
+        assert 'pygit2 not installed' in capsys.readouterr().out
+    
+    def test_initialize_gitlab_api_success(self, cloner, patched_env):
         """Test successful GitLab API initialization."""
-        mock_api = Mock()
-        mock_gitlab_class.return_value = mock_api
-        
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/test/path', 
-            disable_root=False,
-            dry_run=False,
-            exclude=None
-        )
+        mock_api = patched_env.gitlab_class.return_value
         
-        cloner = gc.GitLabCloner(config)
         cloner._initialize_gitlab_api()
         
-        mock_gitlab_class.assert_called_once_with(
+        patched_env.gitlab_class.assert_called_once_with(
             url='https://gitlab.com', 
-            private_token='test-token'
+            private_token='test-token',
+            session=ANY
         )
         mock_api.auth.assert_called_once()
         assert cloner.gitlab_api == mock_api
+
+        session = patched_env.gitlab_class.call_args.kwargs['session']
+        adapter = session.get_adapter('https://gitlab.com')
+        assert adapter._pool_maxsize == 2 * cloner.config.jobs
+        assert adapter.max_retries.total == 3
     
-    @patch('gitlab.Gitlab')
-    @patch('sys.exit')
-    def test_initialize_gitlab_api_failure(self, mock_exit, mock_gitlab_class):
+    def test_initialize_gitlab_api_session_adapter(self, base_config, patched_env):
+        """Test the session handed to python-gitlab is pooled per job and retries."""
+        cloner = gc.GitLabCloner(replace(base_config, jobs=5))
+
+        cloner._initialize_gitlab_api()
+
+        session = patched_env.gitlab_class.call_args.kwargs['session']
+        for prefix in ('https://', 'http://'):
+            adapter = session.adapters[prefix]
+            assert isinstance(adapter, HTTPAdapter)
+            assert adapter._pool_connections == 10
+            assert adapter._pool_maxsize == 10
+        retry = session.get_adapter('https://gitlab.com').max_retries
+        assert retry.backoff_factor == 0.5
+        assert set(retry.status_forcelist) == {429, 502, 503}
+    
+    def test_initialize_gitlab_api_failure(self, base_config, patched_env):
         """Test GitLab API initialization failure."""
-        mock_api = Mock()
-        mock_api.auth.side_effect = Exception("Authentication failed")
-        mock_gitlab_class.return_value = mock_api
-        
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='invalid-token',
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
+        patched_env.gitlab_class.return_value.auth.side_effect = Exception(
+            "Authentication failed"
         )
         
+        config = replace(base_config, token='invalid-token')
+        
         cloner = gc.GitLabCloner(config)
-        cloner._initialize_gitlab_api()
+        with pytest.raises(SystemExit) as exc_info:
+            cloner._initialize_gitlab_api()
         
-        mock_exit.assert_called_once_with(gc.EXIT_GITLAB_ERROR)
+        assert exc_info.value.code == gc.EXIT_GITLAB_ERROR
     
-    @patch.object(gc.GitLabCloner, '_process_projects')
-    @patch.object(gc.GitLabCloner, '_collect_projects')
-    @patch.object(gc.GitLabCloner, '_initialize_gitlab_api')
-    @patch.object(gc.GitLabCloner, '_validate_environment')
-    def test_run_success(self, mock_validate, mock_init_api, mock_collect, mock_process):
+    def test_run_success(self, mocker, cloner):
         """Test successful run execution."""
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
+        mock_validate = mocker.patch.object(
+            gc.GitLabCloner, '_validate_environment', autospec=True
         )
-        
-        cloner = gc.GitLabCloner(config)
+        mock_init_api = mocker.patch.object(
+            gc.GitLabCloner, '_initialize_gitlab_api', autospec=True
+        )
+        mock_iter = mocker.patch.object(gc.GitLabCloner, '_iter_projects', autospec=True)
+        mock_process = mocker.patch.object(
+            gc.GitLabCloner, '_process_projects', autospec=True
+        )
+
         result = cloner.run()
         
         assert result == gc.EXIT_SUCCESS
-        mock_validate.assert_called_once()
-        mock_init_api.assert_called_once()
-        mock_collect.assert_called_once()
-        mock_process.assert_called_once()
+        mock_validate.assert_called_once_with(cloner)
+        mock_init_api.assert_called_once_with(cloner)
+        mock_iter.assert_called_once_with(cloner)
+        mock_process.assert_called_once_with(cloner, mock_iter.return_value)
     
-    @patch.object(gc.GitLabCloner, '_collect_projects')
-    @patch.object(gc.GitLabCloner, '_initialize_gitlab_api')
-    @patch.object(gc.GitLabCloner, '_validate_environment')
-    def test_run_dry_run_mode(self, mock_validate, mock_init_api, mock_collect):
+    def test_run_dry_run_mode(self, mocker, base_config, capsys):
         """Test run execution in dry-run mode."""
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=True,  # Dry run mode
-            exclude=None
+        mock_validate = mocker.patch.object(
+            gc.GitLabCloner, '_validate_environment', autospec=True
+        )
+        mock_init_api = mocker.patch.object(
+            gc.GitLabCloner, '_initialize_gitlab_api', autospec=True
+        )
+        mock_process = mocker.patch.object(
+            gc.GitLabCloner, '_process_projects', autospec=True
         )
+        project = SimpleNamespace(id=1, path_with_namespace='test-ns/repo')
+        mocker.patch.object(
+            gc.GitLabCloner, '_iter_projects', autospec=True, return_value=iter([project])
+        )
+        config = replace(base_config, dry_run=True)
         
         cloner = gc.GitLabCloner(config)
         result = cloner.run()
         
         assert result == gc.EXIT_SUCCESS
-        mock_validate.assert_called_once()
-        mock_init_api.assert_called_once()
-        mock_collect.assert_called_once()
+        mock_validate.assert_called_once_with(cloner)
+        mock_init_api.assert_called_once_with(cloner)
+        assert cloner.projects == {project.id: project}
+        assert 'project: test-ns/repo' in capsys.readouterr().out
         # _process_projects should not be called in dry-run mode
-    
-    @patch.object(gc.GitLabCloner, '_validate_environment')
-    def test_run_exception_handling(self, mock_validate):
-        """Test run exception handling."""
-        mock_validate.side_effect = Exception("Test error")
+        mock_process.assert_not_called()
 
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
+    def test_run_without_pipeline(self, mocker, base_config):
+        """Test --no-pipeline lists every project before processing starts."""
+        mocker.patch.object(gc.GitLabCloner, '_validate_environment', autospec=True)
+        mocker.patch.object(gc.GitLabCloner, '_initialize_gitlab_api', autospec=True)
+        mock_collect = mocker.patch.object(
+            gc.GitLabCloner, '_collect_projects', autospec=True
+        )
+        mock_process = mocker.patch.object(
+            gc.GitLabCloner, '_process_projects', autospec=True
         )
+        config = replace(base_config, pipeline=False)
 
         cloner = gc.GitLabCloner(config)
         result = cloner.run()
 
+        assert result == gc.EXIT_SUCCESS
+        mock_collect.assert_called_once_with(cloner)
+        mock_process.assert_called_once_with(cloner, ANY)
+    
+    def test_run_exception_handling(self, mocker, cloner):
+        """Test run exception handling."""
+        mock_validate = mocker.patch.object(
+            gc.GitLabCloner, '_validate_environment', autospec=True
+        )
+        mock_validate.side_effect = Exception("Test error")
+
+        result = cloner.run()
+
         assert result == gc.EXIT_EXECUTION_ERROR
 
-    def test_collect_projects_traverses_subgroups(self):
+    def test_collect_projects_traverses_subgroups(self, cloner):
         """Ensure subgroup traversal does not rely on ownership filters."""
-        config = gc.Config(
-            url='https://gitlab.com',
-            token='test-token',
-            namespace='test-ns',
-            path='/test/path',
-            disable_root=False,
-            dry_run=False,
-            exclude=None
+        root_project = SimpleNamespace(id=1, path_with_namespace='test-ns/root')
+        subgroup_project = SimpleNamespace(id=2, path_with_namespace='test-ns/sub/repo')
+        subgroup_stub = SimpleNamespace(id=123, full_path='test-ns/sub')
+
+        # Mock only the calls asserted on below
+        root_group = SimpleNamespace(
+            projects=SimpleNamespace(list=Mock(return_value=[root_project])),
+            descendant_groups=SimpleNamespace(list=Mock(return_value=[subgroup_stub])),
+        )
+        subgroup_group = SimpleNamespace(
+            projects=SimpleNamespace(list=lambda **_kwargs: [subgroup_project])
         )
 
-        cloner = gc.GitLabCloner(config)
+        def get_side_effect(identifier, **_kwargs):
+            if identifier == 'test-ns':
+                return root_group
+            if identifier == 123:
+                return subgroup_group
+            raise AssertionError('unexpected group lookup')
 
-        mock_api = Mock()
-        mock_groups = Mock()
-        mock_api.groups = mock_groups
+        mock_groups = SimpleNamespace(get=Mock(side_effect=get_side_effect))
+        cloner.gitlab_api = SimpleNamespace(groups=mock_groups)
+
+        cloner._collect_projects()
+
+        assert root_project.id in cloner.projects
+        assert subgroup_project.id in cloner.projects
+        assert len(cloner.projects) == 2
+        root_group.projects.list.assert_called_once_with(**gc.PROJECT_LIST_OPTIONS)
+        list_kwargs = root_group.projects.list.call_args.kwargs
+        assert list_kwargs['simple'] is True
+        assert list_kwargs['per_page'] == 100
+        root_group.descendant_groups.list.assert_called_once_with(**gc.LIST_OPTIONS)
+        mock_groups.get.assert_any_call(123, lazy=True)
 
+        # descendant_groups covers the whole tree, so each group is resolved once
+        requested = [call.args[0] for call in mock_groups.get.call_args_list]
+        assert requested == ['test-ns', 123]
+
+    def test_collect_projects_deduplicates_by_id(self, cloner):
+        """Ensure a project listed by several groups is collected once."""
+        project = Mock()
+        project.id = 1
+        project.path_with_namespace = 'test-ns/shared'
+
+        cloner.gitlab_api, _ = self._rest_api(
+            [project], [(123, 'test-ns/sub')], {123: self._rest_group([project])}
+        )
+
+        assert list(cloner._iter_projects()) == [project]
+        cloner._collect_projects()
+        assert cloner.projects == {1: project}
+
+    def test_collect_projects_forwards_visibility(self, base_config):
+        """Ensure the visibility filter is passed to GitLab project listings."""
+        cloner = gc.GitLabCloner(replace(base_config, visibility='internal'))
+        cloner.gitlab_api, root_group = self._rest_api()
+
+        cloner._collect_projects()
+
+        root_group.projects.list.assert_called_once_with(
+            **gc.PROJECT_LIST_OPTIONS, visibility='internal'
+        )
+
+    def test_collect_projects_lists_root_projects_in_pool(self, cloner):
+        """Ensure root projects are listed by a worker, not the enumerating thread."""
         root_project = Mock()
         root_project.path_with_namespace = 'test-ns/root'
-        subgroup_project = Mock()
-        subgroup_project.path_with_namespace = 'test-ns/sub/repo'
+        listing_threads = []
+
+        def list_root_projects(**_kwargs):
+            listing_threads.append(threading.current_thread())
+            return [root_project]
+
+        cloner.gitlab_api, root_group = self._rest_api()
+        root_group.projects.list.side_effect = list_root_projects
+
+        cloner._collect_projects()
+
+        assert list(cloner.projects.values()) == [root_project]
+        assert listing_threads and listing_threads[0] is not threading.main_thread()
+
+    @patch.object(gc.GitOperations, 'sync_repository')
+    def test_process_projects_skips_unchanged(self, mock_sync, tmp_path, base_config):
+        """Ensure a second run skips projects without new activity."""
+        config = replace(base_config, path=str(tmp_path), jobs=2)
+
+        def make_projects(last_activity_at):
+            projects = []
+            for project_id, name in enumerate(('repo1', 'repo2')):
+                project = Mock()
+                project.id = project_id
+                project.last_activity_at = '2025-01-01T00:00:00Z'
+                project.path_with_namespace = f'test-ns/{name}'
+                project.http_url_to_repo = f'https://gitlab.com/test-ns/{name}.git'
+                projects.append(project)
+            projects[1].last_activity_at = last_activity_at
+            return projects
+
+        def sync_side_effect(_remote_url, local_path, _options):
+            os.makedirs(local_path, exist_ok=True)
+
+        mock_sync.side_effect = sync_side_effect
+
+        gc.GitLabCloner(config)._process_projects(make_projects('2025-01-01T00:00:00Z'))
+        assert mock_sync.call_count == 2
+        assert (tmp_path / gc.CACHE_FILE_NAME).is_file()
+
+        mock_sync.reset_mock()
+        gc.GitLabCloner(config)._process_projects(make_projects('2025-03-01T00:00:00Z'))
+
+        mock_sync.assert_called_once()
+        assert mock_sync.call_args.args[0] == 'https://gitlab.com/test-ns/repo2.git'
+
+        # Changing how repositories are cloned invalidates the whole cache
+        mock_sync.reset_mock()
+        gc.GitLabCloner(replace(config, depth=0))._process_projects(
+            make_projects('2025-03-01T00:00:00Z')
+        )
+        assert mock_sync.call_count == 2
+
+    @patch('subprocess.run')
+    def test_process_projects_no_cache_syncs_all(self, mock_run, tmp_path, base_config):
+        """Ensure --no-cache syncs projects the cache considers unchanged."""
+        config = replace(base_config, path=str(tmp_path), jobs=1)
+        project = Mock()
+        project.id = 1
+        project.last_activity_at = '2025-01-01T00:00:00Z'
+        project.path_with_namespace = 'test-ns/repo'
+        project.http_url_to_repo = 'https://gitlab.com/test-ns/repo.git'
+        mock_run.return_value.returncode = 0
+
+        def sync_twice(config):
+            gc.GitLabCloner(config)._process_projects([project])
+            (tmp_path / 'test-ns' / 'repo').mkdir(parents=True, exist_ok=True)
+            mock_run.reset_mock()
+            gc.GitLabCloner(config)._process_projects([project])
+            return mock_run.call_count
+
+        assert sync_twice(config) == 0
+        assert sync_twice(replace(config, use_cache=False)) == 1
+
+    @patch.object(gc.GitLabCloner, '_process_single_project')
+    def test_process_projects_sizes_pool_to_jobs(self, mock_process, tmp_path, base_config):
+        """Ensure one worker per configured job processes the projects."""
+        config = replace(base_config, path=str(tmp_path), jobs=3)
+        projects = []
+        for name in ('repo1', 'repo2'):
+            project = Mock()
+            project.path_with_namespace = f'test-ns/{name}'
+            projects.append(project)
+
+        with patch(
+            'gitlab_cloner.cloner.ThreadPoolExecutor', wraps=ThreadPoolExecutor
+        ) as mock_executor:
+            gc.GitLabCloner(config)._process_projects(iter(projects))
+
+        mock_executor.assert_called_once_with(max_workers=config.jobs)
+        assert mock_process.call_count == len(projects)
+
+    @patch.object(gc.GitLabCloner, '_process_single_project')
+    def test_process_projects_stops_workers_on_producer_error(
+        self, mock_process, tmp_path, capsys, mocker, base_config
+    ):
+        """Ensure queued projects are dropped and failures reported when listing fails."""
+        config = replace(base_config, path=str(tmp_path), jobs=1)
+        projects = [
+            SimpleNamespace(id=project_id, path_with_namespace=f'test-ns/repo{project_id}')
+            for project_id in (1, 2, 3)
+        ]
+        started = threading.Event()
+        release = threading.Event()
+
+        def process(project):
+            # Keep the only worker busy while the other projects are queued
+            started.set()
+            assert release.wait(timeout=5)
+            raise gc.GitCloneError('boom')
+
+        mock_process.side_effect = process
+
+        def produce():
+            yield projects[0]
+            assert started.wait(timeout=5)
+            yield from projects[1:]
+            sys.exit(gc.EXIT_GITLAB_ERROR)
+
+        drain_queue = gc.GitLabCloner._drain_queue
 
-        subgroup_stub = Mock()
-        subgroup_stub.id = 123
-        subgroup_stub.full_path = 'test-ns/sub'
+        def drain_then_release(work):
+            drain_queue(work)
+            release.set()
 
+        mocker.patch.object(
+            gc.GitLabCloner, '_drain_queue', side_effect=drain_then_release
+        )
+        cloner = gc.GitLabCloner(config)
+
+        with pytest.raises(SystemExit) as exc_info:
+            cloner._process_projects(iter(produce()))
+
+        assert exc_info.value.code == gc.EXIT_GITLAB_ERROR
+        mock_process.assert_called_once_with(projects[0])
+        captured = capsys.readouterr()
+        assert 'test-ns/repo1: boom' in captured.err
+        assert '1 of 3 projects failed' in captured.err
+
+    def test_collect_projects_skips_excluded_subgroups(self, base_config):
+        """Ensure excluded subgroups and their descendants are never requested."""
+        config = replace(base_config, exclude=['archived', 'legacy'])
+
+        cloner = gc.GitLabCloner(config)
+
+        subgroups = [
+            (1, 'test-ns/archived'),
+            (2, 'test-ns/legacy'),
+            (3, 'test-ns/active'),
+            (4, 'test-ns/legacy/deeper'),
+        ]
+        active_project = Mock()
+        active_project.path_with_namespace = 'test-ns/active/repo'
+        mock_api, _ = self._rest_api(
+            [], subgroups, {3: self._rest_group([active_project])}
+        )
+        cloner.gitlab_api = mock_api
+
+        cloner._collect_projects()
+
+        assert list(cloner.projects.values()) == [active_project]
+        requested = [c.args[0] for c in mock_api.groups.get.call_args_list]
+        assert requested == ['test-ns', 3]
+
+    def test_exclude_is_precompiled(self, base_config):
+        """Ensure projects are matched once each against the compiled pattern."""
+        config = replace(base_config, exclude=['legacy'])
+        assert config.exclude_pattern.pattern == 'legacy'
+
+        projects = []
+        for project_id, name in enumerate(('repo', 'legacy-repo', 'other')):
+            project = Mock()
+            project.id = project_id
+            project.path_with_namespace = f'test-ns/{name}'
+            projects.append(project)
+
+        cloner = gc.GitLabCloner(config)
+        cloner.gitlab_api, _ = self._rest_api(projects)
+
+        cloner._collect_projects()
+        assert [p.path_with_namespace for p in cloner.projects.values()] == [
+            'test-ns/repo', 'test-ns/other'
+        ]
+
+        config.exclude_pattern = Mock(wraps=config.exclude_pattern)
+        cloner._collect_projects()
+        assert config.exclude_pattern.search.call_count == len(projects)
+
+    def test_process_single_project_missing_attributes(self, cloner):
+        """Ensure a project without repository URLs fails with a clear error."""
+        project = Mock(spec=['path_with_namespace'])
+        project.path_with_namespace = 'test-ns/repo'
+
+        with pytest.raises(gc.GitError, match='no repository attributes'):
+            cloner._process_single_project(project)
+
+    @patch.object(gc.GitOperations, 'sync_repository')
+    def test_process_projects_reports_projects_without_path(
+        self, mock_sync, tmp_path, capsys, base_config
+    ):
+        """Ensure projects missing attributes fail alone instead of aborting the run."""
+        config = replace(base_config, path=str(tmp_path), jobs=2)
+        broken = SimpleNamespace(id=1)
+        project = SimpleNamespace(
+            id=2,
+            path_with_namespace='test-ns/repo',
+            http_url_to_repo='https://gitlab.com/test-ns/repo.git',
+        )
+
+        with pytest.raises(SystemExit) as exc_info:
+            gc.GitLabCloner(config)._process_projects(iter([broken, project]))
+
+        assert exc_info.value.code == gc.EXIT_EXECUTION_ERROR
+        mock_sync.assert_not_called()
+        captured = capsys.readouterr()
+        assert captured.err.count('no repository attributes') == 2
+        assert '2 of 2 projects failed' in captured.err
+
+    def test_collect_projects_fetches_subgroups_concurrently(self, base_config):
+        """Ensure subgroup listings overlap and every project is collected."""
+        config = replace(base_config, jobs=4)
+
+        cloner = gc.GitLabCloner(config)
+
+        subgroup_ids = list(range(100, 110))
+        release = threading.Event()
+        overlapped = []
+
+        def make_listing(group_id, project):
+            def list_projects(**_kwargs):
+                if group_id == subgroup_ids[0]:
+                    # Only returns in time if another listing runs meanwhile
+                    overlapped.append(release.wait(timeout=5))
+                elif group_id == subgroup_ids[1]:
+                    release.set()
+                return [project]
+            return list_projects
+
+        groups = {}
+        for group_id in subgroup_ids:
+            project = Mock()
+            project.id = group_id
+            project.path_with_namespace = f'test-ns/sub{group_id}/repo'
+            group = Mock()
+            group.projects.list.side_effect = make_listing(group_id, project)
+            groups[group_id] = group
+
+        subgroups = [(group_id, f'test-ns/sub{group_id}') for group_id in subgroup_ids]
+        cloner.gitlab_api, _ = self._rest_api([], subgroups, groups)
+
+        cloner._collect_projects()
+
+        assert sorted(p.path_with_namespace for p in cloner.projects.values()) == sorted(
+            f'test-ns/sub{group_id}/repo' for group_id in subgroup_ids
+        )
+        assert overlapped == [True]
+
+    def test_iter_tree_projects_streams_while_listing_subgroups(self, base_config):
+        """Ensure projects are yielded before the subgroup listing is exhausted."""
+        cloner = gc.GitLabCloner(replace(base_config, jobs=1))
+        listed = []
+
+        def list_descendants(**_kwargs):
+            for group_id in (100, 101, 102):
+                listed.append(group_id)
+                yield SimpleNamespace(id=group_id, full_path=f'test-ns/sub{group_id}')
+
+        root_project = SimpleNamespace(id=1, path_with_namespace='test-ns/root')
         root_group = Mock()
         root_group.projects.list.return_value = [root_project]
-        root_group.subgroups = Mock()
-        root_group.subgroups.list.return_value = [subgroup_stub]
+        root_group.descendant_groups.list.side_effect = list_descendants
+        subgroup = Mock()
+        subgroup.projects.list.return_value = []
+        cloner.gitlab_api = Mock()
+        cloner.gitlab_api.groups.get.return_value = subgroup
 
-        subgroup_group = Mock()
-        subgroup_group.projects.list.return_value = [subgroup_project]
-        subgroup_group.subgroups = Mock()
-        subgroup_group.subgroups.list.return_value = []
+        projects = cloner._iter_tree_projects(root_group)
 
-        def get_side_effect(identifier, **_kwargs):
-            if identifier == 'test-ns':
-                return root_group
-            if identifier == 123:
-                return subgroup_group
-            raise AssertionError('unexpected group lookup')
+        assert next(projects) is root_project
+        assert listed == [100]
+        assert list(projects) == []
+        assert listed == [100, 101, 102]
+
+    @patch.object(gc.GitOperations, 'sync_repository')
+    def test_process_projects_runs_all_and_reports_failures(
+        self, mock_sync, tmp_path, capsys, base_config
+    ):
+        """Ensure one failing project does not stop the others."""
+        config = replace(base_config, path=str(tmp_path), jobs=2)
 
-        mock_groups.get.side_effect = get_side_effect
+        cloner = gc.GitLabCloner(config)
+        projects = []
+        for project_id, name in enumerate(('good', 'bad', 'other')):
+            project = Mock()
+            project.id = project_id
+            project.last_activity_at = '2025-01-01T00:00:00Z'
+            project.path_with_namespace = f'test-ns/group/{name}'
+            project.http_url_to_repo = f'https://gitlab.com/test-ns/group/{name}.git'
+            projects.append(project)
+
+        def sync_side_effect(remote_url, _local_path, _options):
+            if 'bad' in remote_url:
+                raise gc.GitCloneError('git clone failed: boom')
+
+        mock_sync.side_effect = sync_side_effect
+
+        with pytest.raises(SystemExit) as exc_info:
+            cloner._process_projects(iter(projects))
+
+        assert exc_info.value.code == gc.EXIT_GIT_CLONE_ERROR
+        assert mock_sync.call_count == 3
+        assert (tmp_path / 'test-ns' / 'group').is_dir()
+        captured = capsys.readouterr()
+        assert 'test-ns/group/bad: git clone failed: boom' in captured.err
+        assert '1 of 3 projects failed' in captured.err
+
+    @staticmethod
+    def _rest_group(projects):
+        """Build a mocked REST group listing the given projects."""
+        group = Mock()
+        group.projects.list.return_value = list(projects)
+        return group
+
+    @classmethod
+    def _rest_api(cls, root_projects=(), subgroups=(), groups=None):
+        """Build a mocked REST API serving the test-ns group tree.
+
+        subgroups are (id, full_path) pairs listed as root descendants, and
+        groups maps subgroup ids to the groups they resolve to.
+        """
+        root_group = cls._rest_group(root_projects)
+        root_group.descendant_groups.list.return_value = [
+            SimpleNamespace(id=group_id, full_path=full_path)
+            for group_id, full_path in subgroups
+        ]
+        groups = {'test-ns': root_group, **(groups or {})}
+        mock_api = Mock()
+        mock_api.groups.get.side_effect = lambda identifier, **_kwargs: groups[identifier]
+        return mock_api, root_group
+
+    @staticmethod
+    def _graphql_response(nodes, has_next_page=False, end_cursor=None):
+        """Build a mocked GraphQL HTTP response with one page of projects."""
+        response = Mock()
+        response.json.return_value = {
+            'data': {
+                'group': {
+                    'projects': {
+                        'nodes': nodes,
+                        'pageInfo': {
+                            'endCursor': end_cursor,
+                            'hasNextPage': has_next_page,
+                        },
+                    }
+                }
+            }
+        }
+        return response
+
+    @staticmethod
+    def _graphql_node(project_id, full_path, visibility='private'):
+        """Build a GraphQL project node."""
+        return {
+            'id': f'gid://gitlab/Project/{project_id}',
+            'fullPath': full_path,
+            'httpUrlToRepo': f'https://gitlab.com/{full_path}.git',
+            'sshUrlToRepo': f'git@gitlab.com:{full_path}.git',
+            'lastActivityAt': '2025-01-01T00:00:00Z',
+            'visibility': visibility,
+        }
+
+    def test_collect_projects_graphql(self, base_config):
+        """Ensure GraphQL collection follows cursors and applies exclusions."""
+        config = replace(
+            base_config,
+            url='https://gitlab.com/',
+            exclude=['archived'],
+            api=gc.ApiType.GRAPHQL,
+        )
+
+        cloner = gc.GitLabCloner(config)
+        mock_api = Mock()
+        mock_api.session.post.side_effect = [
+            self._graphql_response(
+                [
+                    self._graphql_node(1, 'test-ns/root'),
+                    self._graphql_node(2, 'test-ns/archived/old'),
+                ],
+                has_next_page=True,
+                end_cursor='cursor-1',
+            ),
+            self._graphql_response([self._graphql_node(3, 'test-ns/sub/repo')]),
+        ]
         cloner.gitlab_api = mock_api
 
         cloner._collect_projects()
 
-        assert root_project in cloner.projects
-        assert subgroup_project in cloner.projects
-        assert len(cloner.projects) == 2
+        assert [p.path_with_namespace for p in cloner.projects.values()] == [
+            'test-ns/root', 'test-ns/sub/repo'
+        ]
+        assert list(cloner.projects) == [1, 3]
+        assert cloner.projects[3].http_url_to_repo == 'https://gitlab.com/test-ns/sub/repo.git'
+        assert mock_api.session.post.call_count == 2
+        assert mock_api.session.post.call_args.args == ('https://gitlab.com/api/graphql',)
+        second_request = mock_api.session.post.call_args.kwargs
+        assert second_request['json']['variables'] == {
+            'fullPath': 'test-ns', 'after': 'cursor-1'
+        }
+        assert second_request['headers'] == {'Authorization': 'Bearer test-token'}
+        mock_api.groups.get.assert_not_called()
+
+    @pytest.mark.parametrize('api', list(gc.ApiType))
+    @pytest.mark.parametrize('exclude', ['test', 'test-ns/sub/test'])
+    def test_collect_projects_excludes_below_root_only(self, base_config, api, exclude):
+        """Ensure root-relative and full-path patterns keep the root subgroups."""
+        cloner = gc.GitLabCloner(replace(base_config, exclude=[exclude], api=api))
+        kept = SimpleNamespace(id=1, path_with_namespace='test-ns/sub/repo')
+        dropped = SimpleNamespace(id=2, path_with_namespace='test-ns/sub/test-repo')
+
+        mock_api, _ = self._rest_api(
+            [], [(10, 'test-ns/sub')], {10: self._rest_group([kept, dropped])}
+        )
+        mock_api.session.post.return_value = self._graphql_response([
+            self._graphql_node(1, 'test-ns/sub/repo'),
+            self._graphql_node(2, 'test-ns/sub/test-repo'),
+        ])
+        cloner.gitlab_api = mock_api
+
+        cloner._collect_projects()
+
+        assert list(cloner.projects) == [1]
+
+    def test_collect_projects_graphql_filters_visibility(self, base_config):
+        """Ensure GraphQL collection keeps only the requested visibility."""
+        config = replace(base_config, api=gc.ApiType.GRAPHQL, visibility='public')
+
+        cloner = gc.GitLabCloner(config)
+        mock_api = Mock()
+        mock_api.session.post.return_value = self._graphql_response([
+            self._graphql_node(1, 'test-ns/open', visibility='public'),
+            self._graphql_node(2, 'test-ns/closed', visibility='private'),
+        ])
+        cloner.gitlab_api = mock_api
+
+        cloner._collect_projects()
+
+        assert list(cloner.projects) == [1]
+
+    def test_collect_projects_graphql_errors(self, base_config):
+        """Ensure GraphQL errors exit with the GitLab error code."""
+        config = replace(base_config, api=gc.ApiType.GRAPHQL)
+
+        cloner = gc.GitLabCloner(config)
+        mock_api = Mock()
+        mock_api.session.post.return_value.json.return_value = {
+            'errors': [{'message': 'boom'}]
+        }
+        cloner.gitlab_api = mock_api
+
+        with pytest.raises(SystemExit) as exc_info:
+            cloner._collect_projects()
+
+        assert exc_info.value.code == gc.EXIT_GITLAB_ERROR
+
+    def test_collect_projects_graphql_falls_back_to_rest(self, base_config):
+        """Ensure a rejected GraphQL request falls back to the REST walk."""
+        config = replace(base_config, api=gc.ApiType.GRAPHQL)
+
+        cloner = gc.GitLabCloner(config)
+        root_project = Mock()
+        root_project.path_with_namespace = 'test-ns/root'
+        mock_api, _ = self._rest_api([root_project])
+        rejected = Mock()
+        rejected.status_code = 403
+        mock_api.session.post.return_value.raise_for_status.side_effect = (
+            requests.HTTPError('403 Forbidden', response=rejected)
+        )
+        cloner.gitlab_api = mock_api
+
+        cloner._collect_projects()
+
+        assert list(cloner.projects.values()) == [root_project]
+        mock_api.session.post.assert_called_once()
 
 
 class TestMainFunction: